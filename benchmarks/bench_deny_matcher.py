@@ -0,0 +1,103 @@
+"""Benchmark the compiled deny-list matcher against the per-report AnalyzerEngine path.
+
+Builds long reports by concatenating ``tests/Reports.json`` and uses every
+capitalized word/phrase and phone/date-like token as a deny term, giving
+hundreds of terms per document.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_deny_matcher.py --repeat 20 --runs 5
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from presidio_analyzer import AnalyzerEngine, PatternRecognizer  # noqa: E402
+from presidio_analyzer.recognizer_registry import RecognizerRegistry  # noqa: E402
+from presidio_anonymizer import AnonymizerEngine  # noqa: E402
+
+from anonymizers import AnonymizeText  # noqa: E402
+from config import replacement  # noqa: E402
+
+
+_TERM_RE = re.compile(r"\b(?:[A-Z][a-z]+(?: [A-Z][a-z]+)*|\d{3}-\d{3}-\d{4}|\d{4})\b")
+
+
+def legacy_anonymize(text, deny_list, entity_names=True):
+    """The original AnonymizeText implementation (one AnalyzerEngine per call)."""
+    registry = RecognizerRegistry()
+    if entity_names:
+        for key, values in deny_list.items():
+            if values:
+                registry.add_recognizer(PatternRecognizer(supported_entity=key, deny_list=values))
+        analyzer = AnalyzerEngine(registry=registry)
+        results = analyzer.analyze(text=text, language="en", entities=list(deny_list.keys()))
+    else:
+        analyzer = AnalyzerEngine()
+        analyzer.registry.add_recognizer(PatternRecognizer(supported_entity=replacement, deny_list=deny_list))
+        results = analyzer.analyze(text=text, language="en", entities=[replacement])
+    anonymized = AnonymizerEngine().anonymize(text=text, analyzer_results=results)
+    return results, anonymized.text
+
+
+def build_inputs(repeat):
+    with open(ROOT / "tests" / "Reports.json", "r", encoding="utf-8") as fh:
+        reports = json.load(fh)
+    text = "\n\n".join(reports.values()) * repeat
+    terms = sorted(set(_TERM_RE.findall(text)))
+    types = ["PERSON", "LOCATION", "ORGANIZATION", "DATE_TIME"]
+    deny = {etype: terms[i::len(types)] for i, etype in enumerate(types)}
+    return text, deny, terms
+
+
+def time_call(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10, help="Times the fixture corpus is concatenated.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", type=str, default=None, help="Optional path to write results as JSON.")
+    args = parser.parse_args()
+
+    text, deny, terms = build_inputs(args.repeat)
+    print(f"Report length: {len(text)} chars, deny terms: {len(terms)}")
+
+    results = {"chars": len(text), "terms": len(terms), "runs": args.runs, "timings": {}}
+    cases = {
+        "legacy_entity": lambda: legacy_anonymize(text, deny, entity_names=True),
+        "matcher_entity": lambda: AnonymizeText(text, deny, entity_names=True),
+        "legacy_redact": lambda: legacy_anonymize(text, terms, entity_names=False),
+        "matcher_redact": lambda: AnonymizeText(text, terms, entity_names=False),
+    }
+    for name, fn in cases.items():
+        timings = time_call(fn, args.runs)
+        results["timings"][name] = timings
+        print(f"{name:16s} median {statistics.median(timings) * 1000:9.1f} ms  min {min(timings) * 1000:9.1f} ms")
+
+    legacy_spans = {(r.start, r.end) for r in legacy_anonymize(text, deny)[0]}
+    matcher_spans = {(r.start, r.end) for r in AnonymizeText(text, deny)[0]}
+    results["span_agreement"] = len(legacy_spans & matcher_spans) / max(len(legacy_spans | matcher_spans), 1)
+    print(f"Span agreement (Jaccard): {results['span_agreement']:.3f}")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Time heading subtree selection and fuzzy heading resolution against the previous implementation.
+
+Synthetic parsed documents (``--docs`` documents of ``--headings`` nested
+headings each, every heading followed by a content line) are run through:
+
+    * ``spans``   -- ``_find_heading_subtree_spans`` (stack pass) vs the per-heading forward scan
+    * ``resolve`` -- ``_resolve_doc_heading_targets`` with one ``HeadingIndex`` for the batch
+      (``process.cdist``) vs pairwise ``fuzz.ratio`` per document
+
+A share of the headings are misspelled variants of the targets, so the fuzzy
+fallback has work to do. The outputs of both implementations are compared and
+any difference is reported.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_headings.py --docs 20 --headings 2000,5000 --json headings.json
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from rapidfuzz import fuzz  # noqa: E402
+
+from parsing import (  # noqa: E402
+    HeadingIndex,
+    _find_heading_subtree_spans,
+    _normalize_heading,
+    _resolve_doc_heading_targets,
+)
+
+
+TARGETS = ["Clinical Summary", "Treatment Plan", "Diagnostic Impressions", "Family History"]
+FILLER = ["Background", "Observations", "Assessment Notes", "Recommendations", "Medications", "Appendix"]
+
+
+def _legacy_normalize(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def legacy_spans(parsed, target_headings):
+    hierarchy = parsed.hierarchy
+    spans = []
+    for idx, ctx in enumerate(hierarchy):
+        token = ctx.token
+        if token.type != "heading" or _legacy_normalize(token.content) not in target_headings:
+            continue
+        end = idx + 1
+        while end < len(hierarchy):
+            next_ctx = hierarchy[end]
+            if next_ctx.token.type == "heading" and next_ctx.level <= ctx.level:
+                break
+            end += 1
+        spans.append((idx, end, token.content))
+    return spans
+
+
+def legacy_resolve(parsed, headings_to_anonymize, match_threshold):
+    targets = {_legacy_normalize(h) for h in headings_to_anonymize if _legacy_normalize(h)}
+    doc_heading_norms = {_legacy_normalize(ctx.token.content) for ctx in parsed.hierarchy if ctx.token.type == "heading"}
+    doc_heading_norms.discard("")
+    for target in list(targets):
+        if target in doc_heading_norms:
+            continue
+        best_heading, best_score = None, 0.0
+        for heading_norm in doc_heading_norms:
+            score = float(fuzz.ratio(target, heading_norm))
+            if score > best_score:
+                best_score, best_heading = score, heading_norm
+        if best_heading is not None and best_score >= float(match_threshold):
+            targets.add(best_heading)
+    return targets
+
+
+def _misspell(text, rng):
+    chars = list(text)
+    pos = rng.randrange(len(chars))
+    chars[pos] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def make_document(doc_id, headings, rng):
+    hierarchy = []
+    level = 1
+    for i in range(headings):
+        level = max(1, min(6, level + rng.choice([-1, 0, 0, 1])))
+        roll = rng.random()
+        if roll < 0.02:
+            content = rng.choice(TARGETS)
+        elif roll < 0.04:
+            content = _misspell(rng.choice(TARGETS), rng)
+        else:
+            content = f"{rng.choice(FILLER)} {i}"
+        hierarchy.append(SimpleNamespace(token=SimpleNamespace(type="heading", content=content, metadata=None), level=level))
+        hierarchy.append(SimpleNamespace(token=SimpleNamespace(type="content", content="Lorem ipsum.", metadata=None), level=level + 1))
+    return SimpleNamespace(hierarchy=hierarchy, metadata={"id": str(doc_id)})
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run_size(docs, headings, args):
+    rng = random.Random(args.seed)
+    documents = [make_document(i, headings, rng) for i in range(docs)]
+    target_norms = {_normalize_heading(h) for h in TARGETS}
+    _normalize_heading.cache_clear()
+
+    legacy_targets, legacy_resolve_s = timed(
+        lambda: [legacy_resolve(doc, TARGETS, args.threshold) for doc in documents]
+    )
+
+    def resolve_all():
+        index = HeadingIndex(documents, sorted(target_norms))
+        return [_resolve_doc_heading_targets(doc, TARGETS, args.threshold, heading_index=index) for doc in documents]
+
+    new_targets, new_resolve_s = timed(resolve_all)
+
+    legacy_spans_out, legacy_spans_s = timed(
+        lambda: [legacy_spans(doc, targets) for doc, targets in zip(documents, legacy_targets)]
+    )
+    new_spans_out, new_spans_s = timed(
+        lambda: [_find_heading_subtree_spans(doc, targets) for doc, targets in zip(documents, legacy_targets)]
+    )
+
+    return {
+        "docs": docs,
+        "headings_per_doc": headings,
+        "spans": {"legacy_s": legacy_spans_s, "new_s": new_spans_s, "mismatches": sum(a != b for a, b in zip(legacy_spans_out, new_spans_out))},
+        "resolve": {"legacy_s": legacy_resolve_s, "new_s": new_resolve_s, "mismatches": sum(a != b for a, b in zip(legacy_targets, new_targets))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20, help="Documents per batch.")
+    parser.add_argument("--headings", type=str, default="500,2000,5000", help="Comma-separated headings per document.")
+    parser.add_argument("--threshold", type=int, default=80, help="Fuzzy match threshold.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Optional path to write results as JSON.")
+    args = parser.parse_args()
+
+    results = []
+    for headings in [int(size) for size in args.headings.split(",") if size.strip()]:
+        result = run_size(args.docs, headings, args)
+        results.append(result)
+        print(f"\n{result['docs']} docs x {headings} headings")
+        for stage in ("spans", "resolve"):
+            timing = result[stage]
+            speedup = timing["legacy_s"] / timing["new_s"] if timing["new_s"] else float("inf")
+            print(f"  {stage:8s} legacy {timing['legacy_s']:8.3f}s  new {timing['new_s']:8.3f}s  "
+                  f"x{speedup:6.1f}  mismatches {timing['mismatches']}")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=4)
+
+
+if __name__ == "__main__":
+    main()
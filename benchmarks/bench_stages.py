@@ -0,0 +1,222 @@
+"""Time each pipeline stage separately on synthetic corpora of growing size.
+
+Stages (per corpus size):
+
+    * ``parse``      -- ``parse_reports`` on the corpus written as a single-column CSV
+    * ``scan:<name>`` -- ``EntityScanner.scan`` for each loaded engine (GLiNER with chunking)
+    * ``batch:<name>`` -- ``NlpBatchRunner`` over the whole corpus (``--stanza-batch-size``,
+      ``--spacy-batch-size``/``--spacy-n-process``)
+    * ``aggregate``  -- ``aggregate_findings`` (the aggregation step of ``process_full_document``)
+    * ``anonymize``  -- ``AnonymizeText``
+    * ``save``       -- ``SaveOutputs`` of the per-report Iterator/Anonymized/PII_Log files
+
+For every stage the script reports docs/sec, p50/p95 per-document latency
+(``parse`` runs once over the corpus, so only its throughput is reported), the
+current RSS after the stage and its change over the stage. Peak RSS only ever
+grows, so it is reported once per corpus size rather than per stage. Engines
+are loaded once, before timing.
+Results are written as JSON so runs before and after a change can be compared.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_stages.py --sizes 10,100,500 --engines spacy,GLiNER --json stages.json
+    python benchmarks/bench_stages.py --engines stanza --json stanza_before.json
+    python benchmarks/bench_stages.py --engines stanza --stanza-processors tokenize,ner --stanza-batch-size 32 --json stanza_after.json
+    python benchmarks/bench_stages.py --engines spacy --spacy-batch-size 64 --spacy-n-process 2 --json spacy.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from synthetic_reports import generate_reports, write_reports  # noqa: E402
+
+from config import Entities, generalwords, headhunter_config, select_configs, timewords  # noqa: E402
+from config import stanza as stanza_config  # noqa: E402
+from helpers import PIIFilter, SaveOutputs  # noqa: E402
+from engines import get_warm_engines  # noqa: E402
+from anonymizers import AnonymizeText, EntityScanner, aggregate_findings  # noqa: E402
+from batching import NlpBatchRunner  # noqa: E402
+from workers import current_rss_mb, peak_rss_mb  # noqa: E402
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def stage_summary(latencies, total, docs, rss_before):
+    rss_after = current_rss_mb()
+    summary = {
+        "total_s": total,
+        "docs_per_sec": docs / total if total else None,
+        "rss_mb": rss_after,
+        "rss_delta_mb": rss_after - rss_before if rss_after is not None and rss_before is not None else None,
+    }
+    if latencies:
+        summary["p50_ms"] = percentile(latencies, 0.50) * 1000
+        summary["p95_ms"] = percentile(latencies, 0.95) * 1000
+    return summary
+
+
+def time_per_doc(fn, items):
+    """Call ``fn(idx, text)`` for every item; return ({idx: result}, latencies, total seconds)."""
+    results, latencies = {}, []
+    started = time.perf_counter()
+    for idx, text in items:
+        call_started = time.perf_counter()
+        results[idx] = fn(idx, text)
+        latencies.append(time.perf_counter() - call_started)
+    return results, latencies, time.perf_counter() - started
+
+
+def time_parse(reports, workdir):
+    import parsing
+
+    csv_path = write_reports(reports, Path(workdir) / "reports.csv")
+    config = dict(headhunter_config, input_path=str(csv_path), content_columns=["report"], id_column="report_id")
+    # Keep the benchmark from overwriting data/parsed/Parsed_Reports.json
+    parsing.parsed_report_location = Path(workdir) / "parsed"
+    started = time.perf_counter()
+    parsing.parse_reports(config)
+    return time.perf_counter() - started
+
+
+def run_size(count, args, engine_configs, warm_engines, pii_filter):
+    reports, _ = generate_reports(count, args.paragraphs, args.seed)
+    items = list(reports.items())
+    stages = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if not args.no_parse:
+            rss_before = current_rss_mb()
+            stages["parse"] = stage_summary([], time_parse(reports, workdir), count, rss_before)
+
+        findings = {idx: {} for idx in reports}
+        for config in engine_configs:
+            name = config["name"]
+            scanner = EntityScanner(warm_engines[name], pii_filter, Entities)
+            use_chunking = name == "GLiNER"
+            rss_before = current_rss_mb()
+            scanned, latencies, total = time_per_doc(lambda idx, text: scanner.scan(text, use_chunking=use_chunking), items)
+            for idx, result in scanned.items():
+                findings[idx][name] = result
+            stages[f"scan:{name}"] = stage_summary(latencies, total, count, rss_before)
+
+        batch_options = {
+            "stanza": {"batch_size": args.stanza_batch_size},
+            "spacy": {"batch_size": args.spacy_batch_size, "n_process": args.spacy_n_process},
+        }
+        for name, options in batch_options.items():
+            if options["batch_size"] and name in warm_engines:
+                runner = NlpBatchRunner(warm_engines[name], Entities, engine_name=name, **options)
+                rss_before = current_rss_mb()
+                started = time.perf_counter()
+                runner.run(reports)
+                stages[f"batch:{name}"] = stage_summary([], time.perf_counter() - started, count, rss_before)
+
+        rss_before = current_rss_mb()
+        doc_data, latencies, total = time_per_doc(lambda idx, text: aggregate_findings(findings[idx], args.mask), items)
+        stages["aggregate"] = stage_summary(latencies, total, count, rss_before)
+
+        is_redact = args.mask == "redact"
+
+        def anonymize(idx, text):
+            deny_list = doc_data[idx]["Redact"] if is_redact else doc_data[idx]["Deny"]
+            return AnonymizeText(text, deny_list, entity_names=not is_redact)
+
+        rss_before = current_rss_mb()
+        anonymized, latencies, total = time_per_doc(anonymize, items)
+        stages["anonymize"] = stage_summary(latencies, total, count, rss_before)
+
+        def save(idx, text):
+            results, anon_report = anonymized[idx]
+            SaveOutputs(doc_data[idx], f"{workdir}/{idx}_Iterator.json")
+            SaveOutputs(anon_report, f"{workdir}/{idx}_Anonymized_Report.json")
+            SaveOutputs([result.to_dict() for result in results], f"{workdir}/{idx}_PII_Log.json")
+
+        rss_before = current_rss_mb()
+        _, latencies, total = time_per_doc(save, items)
+        stages["save"] = stage_summary(latencies, total, count, rss_before)
+
+    return {
+        "docs": count,
+        "chars": sum(len(text) for text in reports.values()),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def print_size(result):
+    print(f"\n{result['docs']} docs, {result['chars']} chars (peak RSS {result['peak_rss_mb']:.1f} MB)")
+    for stage, summary in result["stages"].items():
+        latency = ""
+        if "p50_ms" in summary:
+            latency = f"  p50 {summary['p50_ms']:8.2f} ms  p95 {summary['p95_ms']:8.2f} ms"
+        memory = ""
+        if summary["rss_mb"] is not None:
+            memory = f"  RSS {summary['rss_mb']:8.1f} MB ({summary['rss_delta_mb']:+.1f})"
+        print(f"  {stage:16s} {summary['docs_per_sec']:10.1f} docs/s{latency}{memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=str, default="10,50,200", help="Comma-separated corpus sizes (reports).")
+    parser.add_argument("--paragraphs", type=int, default=2, help="Clinical summary paragraphs per report.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", type=str, default=None, help="Comma-separated engines (default: all configs).")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--mask", type=str, default="entity", choices=["entity", "redact"])
+    parser.add_argument("--stanza-batch-size", type=int, default=0, help="Also time batched Stanza over the corpus.")
+    parser.add_argument("--spacy-batch-size", type=int, default=0, help="Also time spaCy nlp.pipe over the corpus.")
+    parser.add_argument("--spacy-n-process", type=int, default=1)
+    parser.add_argument("--stanza-processors", type=str, default=None,
+                        help="Override the stanza config's processors ('default' for Presidio's full pipeline).")
+    parser.add_argument("--no-parse", action="store_true", help="Skip the headhunter parse stage.")
+    parser.add_argument("--json", type=str, default=None, help="Optional path to write results as JSON.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    engine_names = [name.strip() for name in (args.engines or "").split(",") if name.strip()]
+    engine_configs = select_configs(engine_names)
+    if args.stanza_processors:
+        stanza_config["processors"] = None if args.stanza_processors == "default" else args.stanza_processors
+
+    load_started = time.perf_counter()
+    warm_engines = get_warm_engines(engine_configs, args.device)
+    print(f"Engines loaded in {time.perf_counter() - load_started:.2f}s (peak RSS {peak_rss_mb():.1f} MB)")
+    pii_filter = PIIFilter([], timewords, generalwords)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "engines": [config["name"] for config in engine_configs],
+        "paragraphs": args.paragraphs,
+        "seed": args.seed,
+        "mask": args.mask,
+        "stanza_processors": stanza_config.get("processors"),
+        "stanza_batch_size": args.stanza_batch_size,
+        "spacy_batch_size": args.spacy_batch_size,
+        "spacy_n_process": args.spacy_n_process,
+        "sizes": [],
+    }
+    for count in sizes:
+        result = run_size(count, args, engine_configs, warm_engines, pii_filter)
+        results["sizes"].append(result)
+        print_size(result)
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=4)
+
+
+if __name__ == "__main__":
+    main()
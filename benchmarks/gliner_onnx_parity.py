@@ -0,0 +1,113 @@
+"""Compare the ONNX Runtime GLiNER backend against the PyTorch model.
+
+Runs both backends over the chunks of ``tests/Reports.json`` and reports
+entity-level parity (exact span + label agreement, plus recall/precision of
+the ONNX output against torch) and per-chunk latency. The ONNX export is
+created in the configured directory on first use.
+
+Usage (from the repository root):
+
+    python benchmarks/gliner_onnx_parity.py --runs 3
+    python benchmarks/gliner_onnx_parity.py --no-quantize --json parity.json
+    python benchmarks/gliner_onnx_parity.py --model /path/to/local/gliner --onnx-dir /tmp/gliner-onnx
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from chunking import TextChunker  # noqa: E402
+from config import Entities, GLiNER, chunking_config  # noqa: E402
+from engines import GlinerRecognizer  # noqa: E402
+
+
+def load_chunks():
+    with open(ROOT / "tests" / "Reports.json", "r", encoding="utf-8") as fh:
+        reports = json.load(fh)
+    chunker = TextChunker(**chunking_config)
+    return [chunk.text for text in reports.values() for chunk in chunker.chunk(text)]
+
+
+def run_backend(recognizer, chunks, runs):
+    """Return (entity sets per chunk, per-chunk latencies in seconds) for *recognizer*."""
+    latencies = []
+    spans = []
+    for _ in range(runs):
+        spans = []
+        for text in chunks:
+            start = time.perf_counter()
+            results = recognizer.analyze(text, Entities)
+            latencies.append(time.perf_counter() - start)
+            spans.append({(res.start, res.end, res.entity_type) for res in results})
+    return spans, latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--device", type=str, default="cpu", help="Device for the torch backend.")
+    parser.add_argument("--no-quantize", action="store_true", help="Compare against the fp32 ONNX export.")
+    parser.add_argument("--model", type=str, default=GLiNER["external_model"], help="GLiNER model name or local path.")
+    parser.add_argument("--onnx-dir", type=str, default=str(GLiNER["onnx"]["dir"]), help="Where the ONNX export is written.")
+    parser.add_argument("--threshold", type=float, default=0.5, help="GLiNER score threshold for both backends.")
+    parser.add_argument("--json", type=str, default=None, help="Optional path to write results as JSON.")
+    args = parser.parse_args()
+
+    chunks = load_chunks()
+    print(f"Chunks: {len(chunks)}, model: {args.model}")
+
+    backends = {
+        "torch": GlinerRecognizer(args.model, Entities, args.device, threshold=args.threshold, backend="torch"),
+        "onnx": GlinerRecognizer(args.model, Entities, args.device, threshold=args.threshold, backend="onnx",
+                                 onnx_dir=args.onnx_dir, quantize=not args.no_quantize),
+    }
+
+    results = {"model": args.model, "threshold": args.threshold, "chunks": len(chunks), "runs": args.runs, "quantize": not args.no_quantize, "latency": {}}
+    spans = {}
+    for name, recognizer in backends.items():
+        recognizer.analyze(chunks[0], Entities)  # warm-up
+        spans[name], latencies = run_backend(recognizer, chunks, args.runs)
+        results["latency"][name] = summarize(latencies)
+        stats = results["latency"][name]
+        print(f"{name:6s} mean {stats['mean_ms']:8.1f} ms  p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms")
+
+    reference = set().union(*({(i,) + span for span in chunk} for i, chunk in enumerate(spans["torch"])))
+    candidate = set().union(*({(i,) + span for span in chunk} for i, chunk in enumerate(spans["onnx"])))
+    agreed = reference & candidate
+    results["parity"] = {
+        "torch_entities": len(reference),
+        "onnx_entities": len(candidate),
+        "recall": len(agreed) / len(reference) if reference else None,
+        "precision": len(agreed) / len(candidate) if candidate else None,
+        "identical_chunks": sum(a == b for a, b in zip(spans["torch"], spans["onnx"])) / max(len(chunks), 1),
+    }
+    parity = results["parity"]
+    rate = lambda value: "n/a" if value is None else f"{value:.3f}"  # noqa: E731
+    print(f"Parity: {parity['torch_entities']} torch / {parity['onnx_entities']} onnx entities, "
+          f"recall {rate(parity['recall'])}, precision {rate(parity['precision'])}, "
+          f"identical chunks {parity['identical_chunks']:.1%}")
+    results["speedup"] = results["latency"]["torch"]["mean_ms"] / max(results["latency"]["onnx"]["mean_ms"], 1e-9)
+    print(f"ONNX speedup: {results['speedup']:.2f}x")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=4)
+
+
+if __name__ == "__main__":
+    main()
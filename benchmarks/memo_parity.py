@@ -0,0 +1,87 @@
+"""Check that memoized scanning (``--memo``) matches a full analysis, and report the memo hit rate.
+
+For every engine and every report in the JSON fixtures (``tests/Reports.json``
+and ``tests/test_json_reports.json``, or ``--input``), the filtered spans from a
+normal ``EntityScanner`` scan (whole report, chunks for GLiNER) are compared
+with a scan through a shared ``DetectionMemo``. The corpus is scanned
+``--passes`` times so repeated text exercises memo hits. Any differing span
+(offsets, entity type or score) is printed and the script exits with status 1.
+
+Usage (from the repository root):
+
+    python benchmarks/memo_parity.py --engines spacy,stanza,GLiNER
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from config import Entities, generalwords, select_configs, memo_config, timewords  # noqa: E402
+from helpers import PIIFilter  # noqa: E402
+from engines import get_warm_engines  # noqa: E402
+from anonymizers import EntityScanner  # noqa: E402
+from memo import DetectionMemo, format_memo_stats  # noqa: E402
+
+
+FIXTURES = [ROOT / "tests" / "Reports.json", ROOT / "tests" / "test_json_reports.json"]
+
+
+def load_reports(paths):
+    reports = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as fh:
+            for idx, text in json.load(fh).items():
+                reports[f"{Path(path).stem}/{idx}"] = text
+    return reports
+
+
+def span_set(text, spans):
+    return {(res.start, res.end, res.entity_type, round(res.score, 6), text[res.start:res.end]) for res in spans}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engines", type=str, default=None, help="Comma-separated engines (default: all configs).")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--input", type=str, nargs="*", default=None, help="JSON {id: text} files (default: fixtures).")
+    parser.add_argument("--passes", type=int, default=2, help="Times the corpus is scanned through the memo.")
+    args = parser.parse_args()
+
+    reports = load_reports(args.input or FIXTURES)
+    engine_names = [name.strip() for name in (args.engines or "").split(",") if name.strip()]
+    engine_configs = select_configs(engine_names)
+    warm_engines = get_warm_engines(engine_configs, args.device)
+    pii_filter = PIIFilter([], timewords, generalwords)
+    print(f"Reports: {len(reports)}, engines: {[config['name'] for config in engine_configs]}")
+
+    mismatches = 0
+    for config in engine_configs:
+        name = config["name"]
+        use_chunking = name == "GLiNER"
+        memo = DetectionMemo(memo_config["max_entries"])
+        full_scanner = EntityScanner(warm_engines[name], pii_filter, Entities, engine_name=name)
+        memo_scanner = EntityScanner(warm_engines[name], pii_filter, Entities, engine_name=name, memo=memo)
+
+        engine_mismatches = 0
+        for idx, text in reports.items():
+            expected = span_set(text, full_scanner.scan_spans(text, use_chunking=use_chunking))
+            for _ in range(args.passes):
+                actual = span_set(text, memo_scanner.scan_spans(text, use_chunking=use_chunking))
+                if actual != expected:
+                    engine_mismatches += 1
+                    print(f"  {name} {idx}: missing {sorted(expected - actual)}, extra {sorted(actual - expected)}")
+                    break
+
+        mismatches += engine_mismatches
+        status = "OK" if not engine_mismatches else f"{engine_mismatches} reports differ"
+        print(f"{name}: {status}. {format_memo_stats(memo.stats())}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Synthetic clinical reports with planted PII, modeled on the ``tests/`` fixtures.
+
+Each report has the fixture layout -- a bold key/value header (patient, DOB,
+address, observer, parent contact, school) followed by ``## CLINICAL SUMMARY``,
+``## TREATMENT PLAN`` and ``## Note`` sections -- with names, addresses, phone
+numbers, emails and dates drawn from small pools. Generation is deterministic
+for a given seed.
+
+Usage (from the repository root):
+
+    python benchmarks/synthetic_reports.py --count 500 --paragraphs 6 --out data/raw/Synthetic_Reports.json
+"""
+
+import argparse
+import csv
+import json
+import random
+from pathlib import Path
+
+
+FIRST_NAMES = ["Aisha", "Omar", "Marcus", "Elena", "Jayden", "Priya", "Lucas", "Mei", "Sofia", "Ethan",
+               "Layla", "Noah", "Fatima", "Diego", "Hannah", "Ravi", "Chloe", "Mateo", "Grace", "Tariq"]
+LAST_NAMES = ["Patel", "Hassan", "Jefferson", "Volkov", "Williams", "Kim", "Rivera", "Chen", "Nguyen", "Park",
+              "Okafor", "Moore", "Thompson", "Garcia", "Lee", "Foster", "Davis", "Wright", "Schmidt", "Silva"]
+STREETS = ["Pleasant Boulevard", "Lakeshore Drive", "Evergreen Terrace", "Pine Street", "Michigan Avenue",
+           "Oak Lane", "Maple Court", "Sunset Road", "Harbor Way", "Cedar Avenue"]
+CITIES = [("Los Angeles", "CA", "323"), ("Chicago", "IL", "312"), ("Springfield", "IL", "217"),
+          ("Seattle", "WA", "206"), ("Austin", "TX", "512"), ("Boston", "MA", "617")]
+SCHOOLS = ["Lincoln Elementary", "Lakeview Elementary", "Hollywood Hills Elementary", "Oakwood Middle School",
+           "Riverside Academy"]
+EMPLOYERS = ["Walgreens", "Springfield Memorial Hospital", "Microsoft", "Chicago Children's Hospital",
+             "Oakwood Psychology", "Target"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+
+SUMMARY_SENTENCES = [
+    "{patient} demonstrates age-appropriate developmental functioning with strengths in verbal reasoning.",
+    "{patient} resides at {address} with {parent}, who works at {employer}.",
+    "Teacher reports from {school} indicate {first} completes assignments on time during weekly review.",
+    "During the observation period of {date}, {first} engaged with peers in structured activities.",
+    "{first} scored at the 85th percentile on the district benchmark and attends the DSM-5 screening every month.",
+    "Social interactions include close friendships with classmates {classmate}.",
+    "{parent} can be reached at {phone} and reports improved sleep over the last two weeks.",
+]
+PLAN_SENTENCES = [
+    "Biweekly sessions with {clinician} ({email}, {phone}) focusing on anxiety management.",
+    "Referral to {clinician} at {employer} ({street_address}) for medication evaluation.",
+    "Follow-up scheduled for {date} with a YouTube-based psychoeducation module on Zoom.",
+    "{parent} will coordinate daily check-ins with {school} staff.",
+]
+
+
+def _person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _date(rng):
+    return f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2010, 2025)}"
+
+
+def _phone(rng, area):
+    return f"{area}-555-{rng.randint(0, 9999):04d}"
+
+
+def generate_report(rng, paragraphs=2):
+    """Return ``(text, planted)`` where *planted* maps PII strings to their entity type."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    patient = f"{first} {last}"
+    parent = f"{rng.choice(FIRST_NAMES)} {last}"
+    observer = f"Dr. {_person(rng)}"
+    clinician = f"Dr. {_person(rng)}"
+    city, state, area = rng.choice(CITIES)
+    street_address = f"{rng.randint(100, 9999)} {rng.choice(STREETS)}"
+    address = f"{street_address}, {city}, {state} {rng.randint(10000, 99999)}"
+    phone = _phone(rng, area)
+    email = f"{clinician.split()[-1].lower()}@{rng.choice(SCHOOLS).split()[0].lower()}-schools.org"
+    school = rng.choice(SCHOOLS)
+    employer = rng.choice(EMPLOYERS)
+    dob = _date(rng)
+    values = {
+        "patient": patient, "first": first, "parent": parent, "clinician": clinician, "address": address,
+        "street_address": street_address, "phone": phone, "email": email, "school": school,
+        "employer": employer, "date": _date(rng), "classmate": _person(rng),
+    }
+    planted = {
+        patient: "PERSON", parent: "PERSON", observer[4:]: "PERSON", clinician[4:]: "PERSON",
+        values["classmate"]: "PERSON", address: "LOCATION", phone: "PHONE_NUMBER", email: "EMAIL_ADDRESS",
+        dob: "DATE_TIME", values["date"]: "DATE_TIME", school: "ORGANIZATION", employer: "ORGANIZATION",
+    }
+
+    lines = [
+        "# Clinical Observation Report",
+        "",
+        f"**Patient:** {patient}",
+        f"**DOB:** {dob}",
+        f"**Address:** {address}",
+        f"**Observer:** {observer}, PhD",
+        f"**Parent Contact:** {parent} ({phone})",
+        f"**School:** {school}",
+        "",
+        "## CLINICAL SUMMARY",
+        "",
+    ]
+    for _ in range(paragraphs):
+        sentences = rng.sample(SUMMARY_SENTENCES, k=4)
+        lines += [" ".join(sentence.format(**values) for sentence in sentences), ""]
+    lines += ["## TREATMENT PLAN", ""]
+    for _ in range(max(1, paragraphs // 2)):
+        sentences = rng.sample(PLAN_SENTENCES, k=3)
+        lines += [" ".join(sentence.format(**values) for sentence in sentences), ""]
+    lines += ["## Note", "", f"Report prepared by {observer} on {_date(rng)}."]
+    return "\n".join(lines), planted
+
+
+def generate_reports(count, paragraphs=2, seed=0):
+    """Return ``(reports, planted)``: ``{id: text}`` and ``{id: {pii: entity_type}}`` for *count* reports."""
+    rng = random.Random(seed)
+    reports, planted = {}, {}
+    for i in range(count):
+        idx = f"synth_{i + 1:06d}"
+        reports[idx], planted[idx] = generate_report(rng, paragraphs)
+    return reports, planted
+
+
+def write_reports(reports, path):
+    """Write *reports* as ``.json`` ({id: text}), ``.jsonl`` or single-column ``.csv`` (report_id, report)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["report_id", "report"])
+            writer.writerows(reports.items())
+    elif path.suffix == ".jsonl":
+        with open(path, "w", encoding="utf-8") as fh:
+            for idx, text in reports.items():
+                fh.write(json.dumps({"id": idx, "text": text}) + "\n")
+    else:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(reports, fh, indent=4)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--paragraphs", type=int, default=2, help="Clinical summary paragraphs per report.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=str, required=True, help="Output path (.json, .jsonl or .csv).")
+    args = parser.parse_args()
+
+    reports, _ = generate_reports(args.count, args.paragraphs, args.seed)
+    path = write_reports(reports, args.out)
+    print(f"Wrote {len(reports)} reports to {path}")
+
+
+if __name__ == "__main__":
+    main()
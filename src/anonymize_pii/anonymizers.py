@@ -1,35 +1,79 @@
 
-from config import configs, GlinerRecognizer, Entities, timewords, generalwords, anonymize_location, replacement
-from helpers import PIIFilter, CreateOutputDir, SaveOutputs
+from config import configs, Entities, timewords, generalwords, anonymize_location, replacement, gliner_batch_config, nlp_batch_config, chunking_config, engine_thread_config, detection_cache_config, memo_config
+from helpers import PIIFilter, format_filter_stats
+from matcher import DenyListMatcher
+from batching import GlinerBatchRunner, NlpBatchRunner, find_gliner_recognizer
+from chunking import Chunk, TextChunker
+from fanout import EngineFanout
+from outputs import make_output_writer
+from checkpoint import RunManifest, run_config_hash
+from cache import DetectionCache, format_cache_stats
+from metrics import NULL_METRICS, RunMetrics
+from memo import DetectionMemo, format_memo_stats
 
 import os
 import json
 import csv
 import re
-import spacy
-import textwrap
 from pathlib import Path
 from collections import defaultdict
+from functools import partial
 
-from presidio_analyzer.recognizer_registry import RecognizerRegistry
-from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern
+from presidio_analyzer import RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
 
 import logging
 # Set the logging level for the 'stanza' logger to WARNING or ERROR
 logging.getLogger('stanza').setLevel(logging.ERROR)
 
+# AnonymizerEngine holds no per-report state, so a single instance is reused
+_anonymizer = AnonymizerEngine()
+_default_chunker = TextChunker(**chunking_config)
 
 
 
-def process_full_document(text, configs, warm_engines, pii_filter, mask_arg):
-    # 1. Get findings from every engine
+
+def process_full_document(text, configs, warm_engines, pii_filter, mask_arg, precomputed=None, fanout=None, cache=None,
+                          metrics=NULL_METRICS, memo=None, spans=None):
+    # If *spans* is a dict, each scanned engine's filtered RecognizerResults (document offsets) are stored in it by name
+    # 1. Get findings from every engine (engines already run in batch mode are passed in via precomputed)
+    precomputed = precomputed or {}
+    scans = {}
+    for config in configs:
+        name = config['name']
+        if name not in precomputed:
+            scanner = EntityScanner(warm_engines[name], pii_filter, Entities, cache=cache, engine_name=name, memo=memo)
+            scans[name] = partial(_timed_scan, metrics, name, scanner, text, name == 'GLiNER')
+
+    # With an EngineFanout the engines run concurrently, otherwise one after another
+    if fanout is not None:
+        scanned = fanout.run(scans)
+    else:
+        scanned = {name: scan() for name, scan in scans.items()}
+
     idx_dict = {}
     for config in configs:
         name = config['name']
-        scanner = EntityScanner(warm_engines[name], pii_filter, Entities)
-        idx_dict[name] = scanner.scan(text, use_chunking=(name == 'GLiNER'))
+        if name in precomputed:
+            idx_dict[name] = precomputed[name]
+            continue
+        engine_spans, idx_dict[name] = scanned[name]
+        if spans is not None:
+            spans[name] = engine_spans
+
+    return aggregate_findings(idx_dict, mask_arg)
 
+
+def _timed_scan(metrics, name, scanner, text, use_chunking):
+    with metrics.timer('engine_seconds', engine=name):
+        spans = scanner.scan_spans(text, use_chunking=use_chunking)
+    metrics.observe('chunks_per_document', scanner.chunks_scanned, engine=name)
+    metrics.observe('entities_per_document', len(spans), engine=name)
+    return spans, scanner.findings(text, spans)
+
+
+def aggregate_findings(idx_dict, mask_arg):
+    """Add the 'Deny' map (and 'Redact' list with ``--mask redact``) built from per-engine findings in *idx_dict*."""
     # 2. Aggregation Logic (MasterEntities)
     # This picks the highest score if multiple engines found the same word
     master_map = {}
@@ -54,45 +98,112 @@ def process_full_document(text, configs, warm_engines, pii_filter, mask_arg):
 
 
 class EntityScanner:
-    def __init__(self, analyzer, pii_filter, entities_to_track):
+    def __init__(self, analyzer, pii_filter, entities_to_track, chunker=None, cache=None, engine_name=None, memo=None):
         """
         :param analyzer: The Presidio AnalyzerEngine instance.
         :param pii_filter: An instance of your PIIFilter class.
         :param entities_to_track: List of entity types (e.g., PERSON, DATE).
+        :param chunker: TextChunker used when scanning with chunking (defaults to chunking_config).
+        :param cache: Optional DetectionCache consulted before running the analyzer.
+        :param engine_name: Config name of the engine, used in cache keys.
+        :param memo: Optional DetectionMemo consulted before the cache, per analyzed text (report or chunk).
         """
         self.analyzer = analyzer
         self.pii_filter = pii_filter
         self.entities = entities_to_track
+        self.chunker = chunker or _default_chunker
+        self.cache = cache
+        self.engine_name = engine_name
+        self.memo = memo
+        self.chunks_scanned = 0
 
     def scan(self, text, use_chunking=False):
-        # 1. Prepare text (chunk if necessary, otherwise wrap in a list)
-        items_to_scan = self._chunk_text(text) if use_chunking else [text]
-        pii_dict = {}
+        return self.findings(text, self.scan_spans(text, use_chunking=use_chunking))
+
+    def scan_spans(self, text, use_chunking=False):
+        """Return filtered RecognizerResults with offsets into the full *text*."""
+        # 1. Prepare text (chunks if necessary, otherwise a single chunk at offset 0)
+        if use_chunking:
+            items_to_scan = self._chunk_text(text)
+        else:
+            items_to_scan = [Chunk(text, 0)]
+        self.chunks_scanned = len(items_to_scan)
         # 2. Extract Entities
-        for chunk in items_to_scan:
-            results = self.analyzer.analyze(
-                text=chunk, 
-                language="en", 
-                entities=self.entities
-            )
-            
-            for res in results:
-                entity_text = chunk[res.start:res.end]
-                
-                # 3. Apply Filtering Logic (Integrated RunAnalyzer)
-                if self.pii_filter.is_pii(entity_text):
-                    # 4. Deduplicate and keep highest score
-                    self._update_highest_score(pii_dict, entity_text, res)
+        chunk_results = ((chunk, self._analyze(chunk.text)) for chunk in items_to_scan)
+        return self.merge_chunk_results(text, chunk_results)
+
+    def _analyze(self, text):
+        """Run the analyzer on *text*, going through the memo and detection cache when set."""
+        if self.memo is not None:
+            results = self.memo.get(self.engine_name, text)
+            if results is None:
+                results = self._analyze_uncached(text)
+                self.memo.put(self.engine_name, text, results)
+            return results
+        return self._analyze_uncached(text)
+
+    def _analyze_uncached(self, text):
+        if self.cache is not None:
+            cached = self.cache.get(self.engine_name, text)
+            if cached is not None:
+                return cached
+        results = self.analyzer.analyze(text=text, language="en", entities=self.entities)
+        if self.cache is not None:
+            self.cache.put(self.engine_name, text, results)
+        return results
+
+    def merge_chunk_results(self, text, chunk_results):
+        """
+        Shift ``(chunk, results)`` pairs (e.g. from a batched GLiNER run) to document
+        offsets and drop anything the PII filter rejects.
 
+        Where overlapping chunks both found the same entity (the same or overlapping
+        spans), only the span with the highest score is kept, the longer one on a tie.
+        Overlapping spans from within one chunk are the engine's own output and are kept.
+        """
+        candidates = []
+        chunk_no = -1
+        for chunk_no, (chunk, results) in enumerate(chunk_results):
+            for res in results:
+                candidates.append((chunk_no, RecognizerResult(
+                    entity_type=res.entity_type,
+                    start=chunk.start + res.start,
+                    end=chunk.start + res.end,
+                    score=res.score,
+                    analysis_explanation=res.analysis_explanation,
+                    recognition_metadata=res.recognition_metadata,
+                )))
+        candidates.sort(key=lambda item: (-item[1].score, item[1].start - item[1].end, item[1].start))
+
+        kept = []
+        seen = set()
+        several_chunks = chunk_no > 0
+        for chunk_no, res in candidates:
+            if (res.start, res.end) in seen:
+                continue
+            if several_chunks and any(
+                other_chunk != chunk_no and res.start < other.end and other.start < res.end
+                for other_chunk, other in kept
+            ):
+                continue
+            seen.add((res.start, res.end))
+            kept.append((chunk_no, res))
+
+        # 3. Apply Filtering Logic (Integrated RunAnalyzer)
+        spans = sorted((res for _, res in kept), key=lambda res: (res.start, res.end))
+        keep = self.pii_filter.is_pii_many([text[res.start:res.end] for res in spans])
+        return [res for res, is_pii in zip(spans, keep) if is_pii]
+
+    def findings(self, text, spans):
+        """Collapse spans to ``{entity_text: (entity_type, score)}``."""
+        pii_dict = {}
+        for res in spans:
+            # 4. Deduplicate and keep highest score
+            self._update_highest_score(pii_dict, text[res.start:res.end], res)
         return pii_dict
 
-    def _chunk_text(self, text, max_length=512):
-        return textwrap.wrap(
-            text, 
-            width=max_length, 
-            break_long_words=False, 
-            break_on_hyphens=False
-        )
+    def _chunk_text(self, text):
+        return self.chunker.chunk(text)
 
     def _update_highest_score(self, pii_dict, entity_text, res):
         """Logic from your original loop to keep the most confident entity type."""
@@ -103,26 +214,15 @@ class EntityScanner:
 
 
 def AnonymizeText(text, DenyList, entity_names=True):
-
-    registry = RecognizerRegistry()
-
+    # Deny terms come straight from process_full_document, so match them with a
+    # compiled trie instead of building a Presidio AnalyzerEngine (and NLP engine) per report
     if entity_names==True:
-        # Append Entities to Analyzer and run
-        for key, values in DenyList.items():
-            if values:
-                registry.add_recognizer(PatternRecognizer(supported_entity=key, deny_list=values))
-        analyzer = AnalyzerEngine(registry=registry)
-        results = analyzer.analyze(text=text, language="en", entities=list(DenyList.keys()))
-
+        matcher = DenyListMatcher.from_deny_map(DenyList)
     else:
-        FullScan = PatternRecognizer(supported_entity=replacement, deny_list=DenyList)
-        analyzer = AnalyzerEngine()
-        analyzer.registry.add_recognizer(FullScan)
-        results = analyzer.analyze(text=text, language="en",entities=[replacement])
-
+        matcher = DenyListMatcher.from_terms(DenyList, replacement)
+    results = matcher.analyze(text)
 
-    anonymizer = AnonymizerEngine()
-    anonymized_results = anonymizer.anonymize(
+    anonymized_results = _anonymizer.anonymize(
             text=text,
             analyzer_results=results,
         )
@@ -130,55 +230,301 @@ def AnonymizeText(text, DenyList, entity_names=True):
     return results, anonymized_results.text
 
 
-def RunIterator(Reports, device, mask_arg, output_arg, warm_engines, skiplist):
-    # Initialize tools once (Performance boost: sets are built only once)
-    pii_filter = PIIFilter(skiplist, timewords, generalwords)
-    
-    # Storage for 'merged' mode
-    batch_iterator, batch_anonymized, batch_log = {}, {}, {}
-
-    for idx, text in Reports.items():
-        print(f"Anonymizing {idx}")
-
-        # Detect and Process PII
-        doc_data = process_full_document(text, configs, warm_engines, pii_filter, mask_arg)
-        
-        # Anonymize based on mask_arg
-        is_redact = (mask_arg == 'redact')
-        deny_list = doc_data['Redact'] if is_redact else doc_data['Deny']
-        results, anon_report = AnonymizeText(text, deny_list, entity_names=not is_redact)
-            
-        # Handle Output Logic
-        pii_results_serialized = [result.to_dict() for result in results]
-
-        if output_arg == 'single':
-            # Save to individual subdirectories immediately
-            report_path = os.path.join(anonymize_location, str(idx))
-            CreateOutputDir(report_path)
-            
-            SaveOutputs(doc_data, f'{report_path}/Iterator.json')
-            SaveOutputs(anon_report, f'{report_path}/Anonymized_Report.json')
-            SaveOutputs(pii_results_serialized, f'{report_path}/PII_Log.json')
-            SaveOutputs({idx: text}, f'{report_path}/Original_Report.json')
+def merge_spans(engine_spans):
+    """
+    Merge the filtered spans of several engines into sorted, non-overlapping spans.
+
+    Overlapping spans become one span covering all of them, so every detected
+    character is masked; its entity type and score come from the highest-scoring
+    span, the same rule aggregate_findings applies to surface strings.
+    """
+    ordered = sorted((res for spans in engine_spans for res in spans), key=lambda res: (res.start, -res.end))
+    merged = []
+    for res in ordered:
+        if merged and res.start < merged[-1].end:
+            last = merged[-1]
+            best = res if res.score > last.score else last
+            merged[-1] = RecognizerResult(
+                entity_type=best.entity_type,
+                start=last.start,
+                end=max(last.end, res.end),
+                score=best.score,
+                recognition_metadata=best.recognition_metadata,
+            )
         else:
-            # Store in memory for batch saving at the end
-            batch_iterator[idx] = doc_data
-            batch_anonymized[idx] = anon_report
-            batch_log[idx] = pii_results_serialized
-
-    # Final Batch Save (only for 'merged' or 'batch' mode)
-    if output_arg != 'single':
-        SaveOutputs(batch_iterator, f'{anonymize_location}/Iterator.json')
-        SaveOutputs(batch_anonymized, f'{anonymize_location}/Anonymized_Reports.json')
-        SaveOutputs(batch_log, f'{anonymize_location}/PII_Log.json')
-
-    print("Anonymization Complete")
-
+            merged.append(res)
+    return merged
+
+
+def AnonymizeSpans(text, spans, entity_names=True):
+    """
+    Mask *spans* (sorted and non-overlapping, see merge_spans) in one pass over *text*.
+
+    Returns ``(results, anonymized_text)`` like AnonymizeText: spans become
+    ``<ENTITY_TYPE>``, or ``<{replacement}>`` when *entity_names* is False, which
+    is what Presidio's default replace operator writes. Only the detected
+    positions are masked, not other occurrences of the same string.
+    """
+    results = []
+    pieces = []
+    pos = 0
+    for res in spans:
+        entity_type = res.entity_type if entity_names else replacement
+        pieces.append(text[pos:res.start])
+        pieces.append(f'<{entity_type}>')
+        pos = res.end
+        results.append(
+            RecognizerResult(
+                entity_type=entity_type,
+                start=res.start,
+                end=res.end,
+                score=res.score,
+                recognition_metadata=res.recognition_metadata,
+            )
+        )
+    pieces.append(text[pos:])
+    return results, ''.join(pieces)
 
 
+def anonymize_document(text, doc_data, mask_arg, doc_spans=None, metrics=NULL_METRICS):
+    """
+    Anonymize *text* from its aggregated findings (``Deny``/``Redact`` in *doc_data*),
+    or from each engine's spans when *doc_spans* is given (span masking).
 
+    Returns ``(results, anonymized_text)``.
+    """
+    is_redact = (mask_arg == 'redact')
+    with metrics.timer('anonymize_seconds'):
+        if doc_spans is not None:
+            results, anon_report = AnonymizeSpans(text, merge_spans(doc_spans.values()), entity_names=not is_redact)
+        else:
+            deny_list = doc_data['Redact'] if is_redact else doc_data['Deny']
+            results, anon_report = AnonymizeText(text, deny_list, entity_names=not is_redact)
+    metrics.observe('anonymized_entities_per_document', len(results))
+    return results, anon_report
+
+
+def _windows(items, size):
+    """Yield lists of up to *size* consecutive items."""
+    window = []
+    for item in items:
+        window.append(item)
+        if len(window) == size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+def build_run_state(warm_engines, skiplist, mask_arg, gliner_batch_size=None, engine_parallel=False, cache_path=None,
+                    metrics=None, nlp_batch=None, detection_memo=False, span_mask=False, engine_configs=None):
+    """
+    Bundle everything process_window needs so it can be rebuilt inside worker processes.
+
+    *engine_configs* are the configs the engines were loaded from (default
+    ``configs``); they also identify each engine in the detection cache.
+
+    *nlp_batch* maps engine names to ``NlpBatchRunner`` options
+    (e.g. ``{'stanza': {'batch_size': 32}, 'spacy': {'batch_size': 64, 'n_process': 2}}``).
+    With *span_mask* reports are masked at the detected spans (AnonymizeSpans)
+    instead of by re-matching the deny list (AnonymizeText).
+    """
+    # Initialize tools once (Performance boost: sets are built only once)
+    pii_filter = PIIFilter(skiplist, timewords, generalwords)
+    engine_configs = engine_configs or configs
+    state = {
+        # Only the engines that were loaded take part (see --engines)
+        'configs': [config for config in engine_configs if config['name'] in warm_engines],
+        'warm_engines': warm_engines,
+        'pii_filter': pii_filter,
+        'mask_arg': mask_arg,
+        # Engines run across a whole window of reports at once, by engine name
+        'batch_runners': {},
+        'batch_scanner': EntityScanner(None, pii_filter, Entities),
+        'fanout': None,
+        'cache': None,
+        'metrics': metrics or NULL_METRICS,
+        'memo': DetectionMemo(memo_config['max_entries']) if detection_memo else None,
+        'span_mask': bool(span_mask),
+    }
+
+    # Optional persistent detection cache (one SQLite connection per process)
+    if cache_path:
+        state['cache'] = DetectionCache(
+            cache_path, engine_configs, Entities,
+            max_entries=detection_cache_config['max_entries'],
+            max_bytes=detection_cache_config['max_bytes'],
+        )
 
+    # Optional engine-parallel mode: each document is sent to all engines at once
+    if engine_parallel:
+        torch_threads = sum(engine_thread_config.get(name) or 0 for name in warm_engines) or None
+        state['fanout'] = EngineFanout(list(warm_engines), torch_threads=torch_threads)
+
+    # Optional cross-document GLiNER batching: chunks from a window of reports are run together
+    if gliner_batch_size and 'GLiNER' in warm_engines:
+        state['batch_runners']['GLiNER'] = GlinerBatchRunner(
+            find_gliner_recognizer(warm_engines['GLiNER']),
+            state['batch_scanner']._chunk_text,
+            batch_size=gliner_batch_size,
+            cache=state['cache'],
+        )
 
+    # Optional cross-document NLP batching: whole reports go through the engine's process_batch
+    for name, options in (nlp_batch or {}).items():
+        if name in warm_engines:
+            state['batch_runners'][name] = NlpBatchRunner(
+                warm_engines[name], Entities, cache=state['cache'], engine_name=name, **options
+            )
+    return state
+
+
+def process_window(window, state):
+    """Detect and anonymize a list of ``(idx, text)`` reports, returning one result tuple per report in order."""
+    warm_engines = state['warm_engines']
+    pii_filter = state['pii_filter']
+    mask_arg = state['mask_arg']
+    batch_scanner = state['batch_scanner']
+    metrics = state['metrics']
+
+    batch_findings = {}
+    if state['batch_runners']:
+        reports = dict(window)
+        for name, runner in state['batch_runners'].items():
+            with metrics.timer('batch_seconds', engine=name):
+                batch_findings[name] = runner.run(reports)
+
+    processed = []
+    for idx, text in window:
+        # Detect and Process PII (keeping each engine's spans for span masking)
+        precomputed = {}
+        doc_spans = {} if state['span_mask'] else None
+        for name, findings in batch_findings.items():
+            spans = batch_scanner.merge_chunk_results(text, findings[idx])
+            precomputed[name] = batch_scanner.findings(text, spans)
+            if doc_spans is not None:
+                doc_spans[name] = spans
+            metrics.observe('chunks_per_document', len(findings[idx]), engine=name)
+            metrics.observe('entities_per_document', len(spans), engine=name)
+        doc_data = process_full_document(
+            text, state['configs'], warm_engines, pii_filter, mask_arg,
+            precomputed=precomputed, fanout=state['fanout'], cache=state['cache'], metrics=metrics, memo=state['memo'],
+            spans=doc_spans,
+        )
 
+        # Anonymize based on mask_arg
+        results, anon_report = anonymize_document(text, doc_data, mask_arg, doc_spans, metrics)
 
+        pii_results_serialized = [result.to_dict() for result in results]
+        processed.append((idx, text, doc_data, anon_report, pii_results_serialized))
+    return processed
+
+
+def output_config_hash(engine_configs, skiplist, mask_arg, output_arg, stream=False, detection_memo=False,
+                       output_format='json', span_mask=False):
+    """Run manifest hash of every setting that changes a report's outputs."""
+    return run_config_hash(
+        configs=engine_configs, entities=Entities, timewords=timewords, generalwords=generalwords,
+        skiplist=sorted(skiplist), chunking=chunking_config, mask=mask_arg, output=output_arg, stream=stream,
+        detection_memo=bool(detection_memo), output_format=output_format, span_mask=bool(span_mask),
+    )
+
+
+def RunIterator(Reports, device, mask_arg, output_arg, warm_engines, skiplist, gliner_batch_size=None, workers=1,
+                engine_parallel=False, stream=False, resume=False, cache_path=None, engine_configs=None, metrics_path=None,
+                nlp_batch=None, detection_memo=False, output_format='json', span_mask=False):
+    """
+    Anonymize every report in *Reports*.
+
+    *Reports* is a ``{id: text}`` dict or any iterable of ``(id, text)`` pairs,
+    e.g. the lazy reader from ``helpers.IterReports``. With *stream*, merged
+    output is appended to JSONL files as each report finishes instead of being
+    held in memory until the end.
+
+    With ``workers > 1`` reports are spread over a process pool. If *warm_engines*
+    is given it is inherited by forked workers (shared copy-on-write); if it is
+    None each worker loads its own engines (*engine_configs*, default all
+    ``configs``) with ``get_warm_engines``. With
+    *engine_parallel* each document is sent to all engines concurrently.
+    *gliner_batch_size* and *nlp_batch* (``{engine: NlpBatchRunner options}``)
+    run those engines over windows of reports at a time. With *detection_memo*
+    engines reuse raw results for report texts (and GLiNER chunks) seen
+    earlier in the run (``memo.py``). *output_format* is ``'json'`` or
+    ``'parquet'`` (see ``outputs.py``). With *span_mask* only the positions the
+    engines detected are masked, in one pass, and PII_Log lists those spans.
+
+    Every finished report is recorded in the run manifest (``checkpoint.py``).
+    With *resume*, reports already finished with identical text and config are
+    skipped and the existing outputs are kept. With *cache_path*, raw engine
+    detections are stored in and reused from a ``DetectionCache`` there.
+    With *metrics_path*, timings, per-document counts and progress are written
+    there periodically (see ``metrics.py``) instead of a line per report.
+    """
+    engine_configs = engine_configs or configs
+    config_hash = output_config_hash(
+        engine_configs, skiplist, mask_arg, output_arg, stream, detection_memo, output_format, span_mask,
+    )
+    manifest = RunManifest(anonymize_location, config_hash, resume=resume)
+    writer = make_output_writer(
+        output_arg, anonymize_location, stream=stream, resume_offsets=manifest.offsets, output_format=output_format
+    )
+
+    items = Reports.items() if isinstance(Reports, dict) else Reports
+    items = manifest.pending(items, writer)
+    total = None
+    if isinstance(Reports, dict):
+        # Reports skipped on resume are not part of this run's progress
+        items = list(items)
+        total = len(items)
+    metrics = NULL_METRICS
+    if metrics_path:
+        metrics = RunMetrics(metrics_path, total=total)
+    window_sizes = [gliner_batch_config['docs_per_window']] if gliner_batch_size else []
+    window_sizes += [nlp_batch_config[name]['docs_per_window'] for name in nlp_batch or {}]
+    window_size = max(window_sizes, default=1)
+    windows = _windows(items, window_size)
+    state = None
+
+    if workers and workers > 1:
+        from workers import iter_parallel
+        processed_windows = iter_parallel(
+            windows, workers, warm_engines, device, skiplist, mask_arg, gliner_batch_size, engine_parallel, cache_path,
+            engine_configs=engine_configs, metrics=metrics, nlp_batch=nlp_batch, detection_memo=detection_memo,
+            span_mask=span_mask,
+        )
+    else:
+        state = build_run_state(
+            warm_engines, skiplist, mask_arg, gliner_batch_size, engine_parallel, cache_path, metrics, nlp_batch,
+            detection_memo, span_mask, engine_configs,
+        )
+        processed_windows = (process_window(window, state) for window in windows)
+
+    for processed in processed_windows:
+        for idx, text, doc_data, anon_report, pii_results_serialized in processed:
+            if not metrics.enabled:
+                print(f"Anonymizing {idx}")
+            with metrics.timer('write_seconds'):
+                writer.write(idx, text, doc_data, anon_report, pii_results_serialized)
+            manifest.record(idx, text, writer.offsets())
+            metrics.document_done()
+
+    # Final Batch Save (merged JSON is only written once every report has finished)
+    with metrics.timer('output_close_seconds'):
+        writer.close()
+    if writer.resumable_after_close:
+        manifest.close(writer.offsets())
+    else:
+        manifest.discard()
+    metrics.close()
+
+    if state is not None and state['fanout'] is not None:
+        state['fanout'].shutdown()
+    if state is not None and state['cache'] is not None:
+        print(format_cache_stats(state['cache'].stats()))
+        state['cache'].close()
+    if state is not None and state['memo'] is not None:
+        print(format_memo_stats(state['memo'].stats()))
+    if state is not None:
+        print(format_filter_stats(state['pii_filter'].stats()))
 
+    print("Anonymization Complete")
@@ -0,0 +1,128 @@
+"""Cross-document batched engine execution.
+
+GLiNER: chunks from many reports are pooled, sorted into length buckets so each
+batch pads to a similar length, run through ``GlinerRecognizer.analyze_batch``
+and mapped back to the report and chunk they came from.
+
+NLP engines (Stanza, spaCy): whole reports are sent through the engine's
+``process_batch`` (Stanza ``bulk_process``, spaCy ``nlp.pipe``) by ``NlpBatchRunner``.
+"""
+
+from chunking import Chunk
+from engines import GlinerRecognizer
+
+
+def find_gliner_recognizer(analyzer):
+    """Return the ``GlinerRecognizer`` registered on a warm AnalyzerEngine."""
+    for recognizer in analyzer.registry.recognizers:
+        if isinstance(recognizer, GlinerRecognizer):
+            return recognizer
+    raise ValueError("Analyzer engine has no GlinerRecognizer registered")
+
+
+class GlinerBatchRunner:
+    def __init__(self, recognizer, chunker, batch_size=8, cache=None, engine_name='GLiNER'):
+        """
+        :param recognizer: The warm ``GlinerRecognizer`` instance.
+        :param chunker: Callable splitting a report into ``Chunk`` objects.
+        :param batch_size: Number of chunks per GLiNER forward pass.
+        :param cache: Optional DetectionCache; cached chunks are not sent to the model.
+        :param engine_name: Config name of the engine, used in cache keys.
+        """
+        self.recognizer = recognizer
+        self.chunker = chunker
+        self.batch_size = max(1, int(batch_size))
+        self.cache = cache
+        self.engine_name = engine_name
+
+    def run(self, reports):
+        """
+        Analyze every chunk of every report in *reports* ({id: text}).
+
+        Returns ``{id: [(chunk, [RecognizerResult, ...]), ...]}`` with chunks in
+        document order. Result offsets are relative to their chunk; add
+        ``chunk.start`` to map them onto the report.
+        """
+        chunk_index = []
+        per_doc = {}
+        for doc_id, text in reports.items():
+            chunks = self.chunker(text)
+            per_doc[doc_id] = []
+            for pos, chunk in enumerate(chunks):
+                cached = self.cache.get(self.engine_name, chunk.text) if self.cache is not None else None
+                per_doc[doc_id].append((chunk, cached or []))
+                if cached is None:
+                    chunk_index.append((doc_id, pos, chunk))
+
+        for batch in self._length_buckets(chunk_index):
+            batch_results = self.recognizer.analyze_batch([chunk.text for _, _, chunk in batch])
+            for (doc_id, pos, chunk), results in zip(batch, batch_results):
+                per_doc[doc_id][pos] = (chunk, results)
+                if self.cache is not None:
+                    self.cache.put(self.engine_name, chunk.text, results)
+
+        return per_doc
+
+    def _length_buckets(self, chunk_index):
+        """Yield batches of similar-length chunks (longest first) to minimize padding."""
+        ordered = sorted(chunk_index, key=lambda item: len(item[2].text), reverse=True)
+        for start in range(0, len(ordered), self.batch_size):
+            yield ordered[start:start + self.batch_size]
+
+
+class NlpBatchRunner:
+    """
+    Run whole reports through an analyzer's NLP engine in batches (``BatchAnalyzerEngine``).
+
+    Used for engines whose ``process_batch`` is faster than per-report ``analyze`` calls:
+    ``LeanStanzaNlpEngine`` (one Stanza ``bulk_process`` call per batch) and Presidio's
+    ``SpacyNlpEngine`` (``nlp.pipe`` with *batch_size* and *n_process*).
+    """
+
+    def __init__(self, analyzer, entities, batch_size=32, n_process=1, cache=None, engine_name=None):
+        """
+        :param analyzer: The warm AnalyzerEngine.
+        :param entities: Entity types requested from the analyzer.
+        :param batch_size: Reports per ``process_batch`` batch.
+        :param n_process: Processes used by ``process_batch`` (ignored by engines that do not support it).
+        :param cache: Optional DetectionCache; cached reports are not sent to the engine.
+        :param engine_name: Config name of the engine, used in cache keys.
+        """
+        from presidio_analyzer import BatchAnalyzerEngine
+
+        self.batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
+        self.entities = entities
+        self.batch_size = max(1, int(batch_size))
+        self.n_process = max(1, int(n_process))
+        self.cache = cache
+        self.engine_name = engine_name
+
+    def run(self, reports):
+        """
+        Analyze every report in *reports* ({id: text}).
+
+        Returns ``{id: [(Chunk(text, 0), [RecognizerResult, ...])]}``, the same shape as
+        ``GlinerBatchRunner.run``, so ``EntityScanner.merge_chunk_results`` applies unchanged.
+        """
+        per_doc = {}
+        to_run = []
+        for doc_id, text in reports.items():
+            cached = self.cache.get(self.engine_name, text) if self.cache is not None else None
+            per_doc[doc_id] = [(Chunk(text, 0), cached or [])]
+            if cached is None:
+                to_run.append(doc_id)
+
+        if to_run:
+            batch_results = self.batch_analyzer.analyze_iterator(
+                [reports[doc_id] for doc_id in to_run],
+                language="en",
+                batch_size=self.batch_size,
+                n_process=self.n_process,
+                entities=self.entities,
+            )
+            for doc_id, results in zip(to_run, batch_results):
+                per_doc[doc_id] = [(Chunk(reports[doc_id], 0), results)]
+                if self.cache is not None:
+                    self.cache.put(self.engine_name, reports[doc_id], results)
+
+        return per_doc
@@ -0,0 +1,187 @@
+"""Persistent on-disk cache of raw engine detections.
+
+``EntityScanner`` asks the cache before running an engine on a chunk of text.
+Entries hold the engine's unfiltered ``RecognizerResult`` spans (relative to
+the chunk) with their ``recognition_metadata``, so PII filter or skiplist
+changes still apply on a cache hit and the PII log matches an uncached run.
+Keys combine a hash of the text with the engine name, its model identifiers,
+library versions and the tracked entity list, so changing any of them misses.
+
+The store is a local SQLite file with least-recently-used eviction bounded by
+entry count and payload size. ``evict_lru`` and the hit statistics helpers are
+shared with the parse cache (``parse_cache.py``).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from importlib import metadata
+
+from presidio_analyzer import RecognizerResult
+
+
+# Bounds are checked every this many inserts rather than on each one
+EVICT_CHECK_INTERVAL = 256
+
+# Libraries whose version changes can change an engine's output
+_ENGINE_PACKAGES = {
+    'spacy': ['presidio-analyzer', 'spacy'],
+    'stanza': ['presidio-analyzer', 'stanza', 'spacy-stanza'],
+    'passthrough': ['presidio-analyzer'],
+}
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def engine_cache_id(config):
+    """Identity of an engine config: name, NLP models and processors, external model and library versions."""
+    nlp_configuration = config.get('config') or {}
+    engine_name = nlp_configuration.get('nlp_engine_name')
+    packages = list(_ENGINE_PACKAGES.get(engine_name, ['presidio-analyzer']))
+    if config.get('external_model'):
+        packages.append('gliner')
+    if config.get('backend') == 'onnx':
+        packages.append('onnxruntime')
+    identity = {
+        'name': config.get('name'),
+        'nlp_engine': engine_name,
+        'models': nlp_configuration.get('models'),
+        'external_model': config.get('external_model'),
+        'processors': config.get('processors'),
+        'backend': config.get('backend'),
+        'quantize': (config.get('onnx') or {}).get('quantize') if config.get('backend') == 'onnx' else None,
+        'versions': {package: _package_version(package) for package in packages},
+    }
+    return json.dumps(identity, sort_keys=True, default=str)
+
+
+def evict_lru(conn, table, max_entries, max_bytes=None):
+    """
+    Delete least recently used rows of *table* until it holds at most *max_entries* rows and,
+    when *max_bytes* is set, at most that many payload bytes.
+
+    *table* needs ``key`` and ``last_used`` columns, plus ``size`` when *max_bytes* is set.
+    """
+    size = 'size' if max_bytes is not None else '0'
+    max_bytes = float('inf') if max_bytes is None else max_bytes
+    entries, total = conn.execute(f'SELECT COUNT(*), COALESCE(SUM({size}), 0) FROM {table}').fetchone()
+    if entries <= max_entries and total <= max_bytes:
+        return
+    # Walk from least recently used, deleting until both bounds hold
+    doomed = []
+    for key, row_size in conn.execute(f'SELECT key, {size} FROM {table} ORDER BY last_used'):
+        if entries <= max_entries and total <= max_bytes:
+            break
+        doomed.append((key,))
+        entries -= 1
+        total -= row_size
+    conn.executemany(f'DELETE FROM {table} WHERE key = ?', doomed)
+
+
+def hit_stats(hits, misses):
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / lookups if lookups else 0.0,
+    }
+
+
+def format_hit_stats(label, stats):
+    return (
+        f"{label}: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.1%} hit rate)"
+    )
+
+
+def format_cache_stats(stats):
+    return format_hit_stats('Detection cache', stats)
+
+
+class DetectionCache:
+    def __init__(self, path, configs, entities, max_entries=500_000, max_bytes=2 * 1024 ** 3):
+        """
+        :param path: SQLite file to use (created if missing).
+        :param configs: Engine configs; each config's identity becomes part of its keys.
+        :param entities: Entity types requested from the engines.
+        :param max_entries: Evict least recently used entries beyond this count.
+        :param max_bytes: Evict least recently used entries beyond this total payload size.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._engine_ids = {config['name']: engine_cache_id(config) for config in configs}
+        self._entities = json.dumps(list(entities))
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS detections ('
+            'key TEXT PRIMARY KEY, engine TEXT, payload TEXT, size INTEGER, last_used REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS detections_last_used ON detections (last_used)')
+        self._conn.commit()
+
+    def _key(self, engine_name, text):
+        digest = hashlib.sha256()
+        for part in (self._engine_ids[engine_name], self._entities, text):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, engine_name, text):
+        """Return cached results for *text* from *engine_name*, or None on a miss."""
+        key = self._key(engine_name, text)
+        with self._lock:
+            row = self._conn.execute('SELECT payload FROM detections WHERE key = ?', (key,)).fetchone()
+            rows = json.loads(row[0]) if row is not None else None
+            # Entries written before recognition_metadata was stored are re-detected
+            if rows is None or any(len(entry) != 5 for entry in rows):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute('UPDATE detections SET last_used = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        return [
+            RecognizerResult(
+                entity_type=entity_type, start=start, end=end, score=score, recognition_metadata=metadata,
+            )
+            for entity_type, start, end, score, metadata in rows
+        ]
+
+    def put(self, engine_name, text, results):
+        payload = json.dumps(
+            [[res.entity_type, res.start, res.end, res.score, res.recognition_metadata] for res in results],
+            default=str,
+        )
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO detections (key, engine, payload, size, last_used) VALUES (?, ?, ?, ?, ?)',
+                (self._key(engine_name, text), engine_name, payload, len(payload), time.time()),
+            )
+            self._puts += 1
+            if self._puts % EVICT_CHECK_INTERVAL == 0:
+                evict_lru(self._conn, 'detections', self.max_entries, self.max_bytes)
+            self._conn.commit()
+
+    def stats(self):
+        return hit_stats(self.hits, self.misses)
+
+    def close(self):
+        with self._lock:
+            evict_lru(self._conn, 'detections', self.max_entries, self.max_bytes)
+            self._conn.commit()
+            self._conn.close()
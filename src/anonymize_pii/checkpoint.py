@@ -0,0 +1,97 @@
+"""Per-report completion manifest for resumable runs.
+
+``Run_Manifest.jsonl`` lives next to the outputs in ``anonymize_location``. One
+line is appended after each report's outputs have been written, holding the
+report id, a hash of its text, a hash of the run configuration and the byte
+offsets of any append-only output files at that point. With ``--resume``,
+reports whose id, text and config all match are skipped, and append-only
+outputs are truncated back to the last recorded offsets so a crash mid-write
+never leaves a partial record behind. A run that completes appends a final
+offsets-only line, since closing a writer can rewrite its files.
+"""
+
+import hashlib
+import json
+import os
+
+
+MANIFEST_NAME = 'Run_Manifest.jsonl'
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def run_config_hash(**settings):
+    """Stable hash of everything that affects a report's outputs (models, entities, filters, mask...)."""
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RunManifest:
+    def __init__(self, location, config_hash, resume=False):
+        """
+        :param location: Output directory holding the manifest.
+        :param config_hash: Hash from ``run_config_hash`` for this run.
+        :param resume: Load the existing manifest and skip finished reports; otherwise start a new one.
+        """
+        self.path = os.path.join(location, MANIFEST_NAME)
+        self.config_hash = config_hash
+        self.done = {}
+        self.offsets = None
+        if resume:
+            self._load()
+        self.handle = open(self.path, 'ab' if resume else 'wb')
+
+    def _load(self):
+        """Read committed entries; a trailing partial line from a crash is cut off."""
+        if not os.path.exists(self.path):
+            return
+        committed = 0
+        with open(self.path, 'rb') as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                committed += len(line)
+                if 'id' in entry:
+                    self.done[entry['id']] = (entry['content_hash'], entry['config_hash'])
+                self.offsets = entry.get('offsets')
+        os.truncate(self.path, committed)
+
+    def is_done(self, idx, text):
+        return self.done.get(str(idx)) == (content_hash(text), self.config_hash)
+
+    def pending(self, items, writer):
+        """Yield ``(idx, text)`` pairs that still need processing, telling *writer* which finished ones to keep."""
+        for idx, text in items:
+            if self.is_done(idx, text):
+                print(f"Skipping {idx} (already complete)")
+                writer.keep(idx)
+                continue
+            yield idx, text
+
+    def record(self, idx, text, offsets=None):
+        """Mark *idx* finished. Call only after its outputs are fully written."""
+        entry = {
+            'id': str(idx),
+            'content_hash': content_hash(text),
+            'config_hash': self.config_hash,
+            'offsets': offsets,
+        }
+        self.handle.write((json.dumps(entry) + '\n').encode('utf-8'))
+        self.handle.flush()
+
+    def discard(self):
+        """Close and delete the manifest: the finished outputs cannot be extended by a later --resume."""
+        self.handle.close()
+        os.remove(self.path)
+
+    def close(self, offsets=None):
+        """Close the manifest, first recording the final *offsets* of outputs rewritten when the writer closed."""
+        if offsets is not None:
+            self.handle.write((json.dumps({'offsets': offsets}) + '\n').encode('utf-8'))
+        self.handle.close()
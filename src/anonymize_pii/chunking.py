@@ -0,0 +1,118 @@
+"""Token-aware, sentence-aligned chunking for chunked engines (GLiNER).
+
+Chunks are exact slices of the source text, so ``chunk.start + result.start``
+is a valid offset into the original document. Budgets are counted with
+GLiNER's own word splitter, which is what its ``max_len`` limit counts.
+"""
+
+import re
+from typing import Callable, NamedTuple
+
+
+# GLiNER's default WhitespaceTokenSplitter pattern
+_GLINER_WORD_RE = re.compile(r"\w+(?:[-_]\w+)*|\S")
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+
+class Chunk(NamedTuple):
+    text: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+def count_gliner_words(text: str) -> int:
+    """Count tokens the way GLiNER's ``max_len`` does."""
+    return sum(1 for _ in _GLINER_WORD_RE.finditer(text))
+
+
+def sentence_spans(text: str) -> list[tuple[int, int]]:
+    """Return ``(start, end)`` offsets of sentences/paragraphs with surrounding whitespace trimmed."""
+    spans: list[tuple[int, int]] = []
+    prev = 0
+    for match in _SENTENCE_BREAK_RE.finditer(text):
+        _append_trimmed(text, prev, match.start(), spans)
+        prev = match.end()
+    _append_trimmed(text, prev, len(text), spans)
+    return spans
+
+
+def _append_trimmed(text: str, start: int, end: int, spans: list[tuple[int, int]]) -> None:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+
+
+class TextChunker:
+    def __init__(
+        self,
+        max_tokens: int = 384,
+        overlap_tokens: int = 48,
+        count_tokens: Callable[[str], int] = count_gliner_words,
+    ):
+        """
+        :param max_tokens: Token budget per chunk. Keep it below the model's ``max_len``
+            to leave room for the label prompt GLiNER prepends to every input.
+        :param overlap_tokens: Budget of trailing sentences repeated at the start of the next chunk
+            (trailing words, between the pieces of a sentence that is split for being over budget).
+        :param count_tokens: Callable returning the token count of a string.
+        """
+        self.max_tokens = max(1, int(max_tokens))
+        self.overlap_tokens = max(0, min(int(overlap_tokens), self.max_tokens - 1))
+        self.count_tokens = count_tokens
+
+    def chunk(self, text: str) -> list[Chunk]:
+        chunks: list[Chunk] = []
+        for start, end, _ in self._pack(self._units(text)):
+            chunks.append(Chunk(text[start:end], start))
+        return chunks
+
+    def _pack(self, units: list[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+        """Group ``(start, end, tokens)`` units into windows up to the budget, overlapping by ``overlap_tokens``."""
+        windows: list[tuple[int, int, int]] = []
+        first = 0
+        while first < len(units):
+            # Greedily pack whole units up to the token budget
+            last = first
+            used = units[first][2]
+            while last + 1 < len(units) and used + units[last + 1][2] <= self.max_tokens:
+                last += 1
+                used += units[last][2]
+
+            windows.append((units[first][0], units[last][1], used))
+            if last + 1 >= len(units):
+                break
+
+            # Step back over trailing units that fit in the overlap budget, always making progress
+            next_first = last + 1
+            overlap = 0
+            while next_first - 1 > first and overlap + units[next_first - 1][2] <= self.overlap_tokens:
+                next_first -= 1
+                overlap += units[next_first][2]
+            first = next_first
+
+        return windows
+
+    def _units(self, text: str) -> list[tuple[int, int, int]]:
+        """
+        Sentence spans with token counts. Sentences over budget are split at word boundaries
+        into pieces that overlap like chunks do, so an entity across a piece boundary is seen whole.
+        """
+        units: list[tuple[int, int, int]] = []
+        for start, end in sentence_spans(text):
+            tokens = self.count_tokens(text[start:end])
+            if tokens <= self.max_tokens:
+                units.append((start, end, tokens))
+                continue
+
+            words = [
+                (word.start(), word.end(), self.count_tokens(word.group()))
+                for word in _GLINER_WORD_RE.finditer(text, start, end)
+            ]
+            units.extend(self._pack(words))
+        return units
@@ -0,0 +1,73 @@
+"""Small client for the local anonymization service (``server.py``), standard library only.
+
+    client = AnonymizationClient()                      # server_config host/port
+    client = AnonymizationClient(unix_socket='/tmp/anonymize.sock')
+    result = client.anonymize("John Smith was seen on 2024-01-02.", report_id="1")
+    results = client.anonymize_batch({"1": "...", "2": "..."})
+
+Each result is ``{"id", "anonymized", "pii_log", "iterator"}``, matching the
+CLI's Anonymized_Report, PII_Log and Iterator outputs for that report.
+"""
+
+import http.client
+import json
+import socket
+
+from config import server_config
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class AnonymizationClient:
+    def __init__(self, host=None, port=None, unix_socket=None, timeout=300.0):
+        self.host = host or server_config['host']
+        self.port = port or server_config['port']
+        self.unix_socket = unix_socket
+        self.timeout = timeout
+
+    def anonymize(self, text, report_id=None):
+        """Anonymize one report and return its result."""
+        payload = {'text': text}
+        if report_id is not None:
+            payload['id'] = report_id
+        return self._request('POST', '/anonymize', payload)
+
+    def anonymize_batch(self, reports):
+        """Anonymize ``{id: text}`` (or ``(id, text)`` pairs) and return results in the same order."""
+        items = reports.items() if isinstance(reports, dict) else reports
+        payload = {'reports': [{'id': idx, 'text': text} for idx, text in items]}
+        return self._request('POST', '/anonymize', payload)['reports']
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def _request(self, method, path, payload=None):
+        if self.unix_socket:
+            conn = _UnixHTTPConnection(self.unix_socket, self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            data = json.loads(response.read() or b'{}')
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise ServiceError(response.status, data.get('error', response.reason))
+        return data
@@ -2,14 +2,6 @@
 import os
 from pathlib import Path
 
-import torch
-
-from presidio_analyzer import EntityRecognizer, RecognizerResult, AnalyzerEngine
-from presidio_analyzer.nlp_engine import NlpEngineProvider, NlpEngine, SpacyNlpEngine, NerModelConfiguration
-from presidio_analyzer.recognizer_registry import RecognizerRegistry
-
-from gliner import GLiNER as glmodel
-
 # Directory and Filepath Locations
 base_path = Path.cwd()
 root_dir = base_path.parents[1]
@@ -39,75 +31,122 @@ stanza = {
     'config' : {
         "nlp_engine_name": "stanza",
         "models": [{"lang_code": "en", "model_name": "en"}]
-        }
+        },
+    # Stanza processors to load (LeanStanzaNlpEngine, e.g. 'tokenize,ner' or --stanza-processors); None keeps
+    # Presidio's tokenize,pos,lemma,ner pipeline. Without 'lemma' context words no longer boost pattern recognizer scores.
+    'processors': None,
 }
 GLiNER = {
     'name':'GLiNER',
-    'config' : {"nlp_engine_name": "spacy", "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}]},
-    'external_model': "nvidia/gliner-pii"
+    # GlinerRecognizer ignores nlp_artifacts, so no spaCy pipeline is loaded for this engine
+    'config' : {"nlp_engine_name": "passthrough", "models": [{"lang_code": "en"}]},
+    'external_model': "nvidia/gliner-pii",
+    # 'torch' runs the PyTorch model; 'onnx' runs an ONNX Runtime export (faster on CPU-only nodes).
+    # The export is written to onnx['dir'] on first use; quantize=True adds dynamic int8 weights.
+    'backend': 'torch',
+    'onnx': {'dir': root_dir / 'data' / 'models' / 'gliner-pii-onnx', 'quantize': True},
 }
 
 configs = [spacy, stanza, GLiNER]
 
+# Chunking for GLiNER (token counts use GLiNER's word splitter, which is what max_len=512 counts)
+# - max_tokens: chunk budget, kept under max_len to leave room for the entity label prompt
+# - overlap_tokens: trailing sentences repeated in the next chunk so boundary entities are not lost
+chunking_config = {
+    'max_tokens': 384,
+    'overlap_tokens': 48,
+}
 
-class GlinerRecognizer(EntityRecognizer):
-    def __init__(self, model_name: str, labels: list[str], device: str, **kwargs):
-        self.model = glmodel.from_pretrained(model_name).to(device)
-        self.labels = labels
-        super().__init__(supported_entities=labels, **kwargs)
-
-    def load(self) -> None:
-        pass
-
-    def analyze(self, text: str, entities: list[str], nlp_artifacts=None) -> list[RecognizerResult]:
-        results = []
-        gliner_results = self.model.predict_entities(text, self.labels, threshold=0.5, max_len=512)
-        for res in gliner_results:
-            # Convert GLiNER output to Presidio RecognizerResult
-            results.append(
-                RecognizerResult(
-                    entity_type=res["label"],
-                    start=res["start"],
-                    end=res["end"],
-                    score=res["score"]
-                )
-            )
-        return results
-
-    def shutdown(self):
-        # Move model to CPU and clear cache to free VRAM
-        if hasattr(self, 'model'):
-            self.model.to("cpu")
-            del self.model
-            torch.cuda.empty_cache()
-
-
-
-def get_warm_engines(configs, device):
-    warm_engines = {}
-    for config in configs:
-        name = config.get('name')
-        
-        # Pass the config dict directly to the constructor
-        # Note: config.get('config') is the dictionary defined in your 'spacy' or 'stanza' variables
-        provider = NlpEngineProvider(nlp_configuration=config.get('config'))
-        engine = provider.create_engine()
-        registry = RecognizerRegistry()
-
-        if name == 'GLiNER':
-            gliner_rec = GlinerRecognizer(
-                model_name=config.get('external_model'), 
-                labels=Entities, 
-                device=device
-            )
-            registry.add_recognizer(gliner_rec)
-            warm_engines[name] = AnalyzerEngine(nlp_engine=engine, registry=registry)
-        else:
-            # Load default recognizers (regex, etc) for SpaCy/Stanza
-            registry.load_predefined_recognizers()
-            warm_engines[name] = AnalyzerEngine(nlp_engine=engine, registry=registry)
-            
-    return warm_engines
+# Engine-parallel execution (--engine-parallel): torch's intra-op thread count is process-wide, so the
+# values of the loaded engines are summed into one budget set once before the engines run concurrently.
+# None entries add nothing; if all are None torch's default is kept.
+engine_thread_config = {
+    'spacy': None,
+    'stanza': 2,
+    'GLiNER': 4,
+}
+
+# Persistent detection cache (--cache): raw per-engine findings keyed by text hash and engine identity
+detection_cache_config = {
+    'path': root_dir / 'data' / 'cache' / 'detections.sqlite',
+    'max_entries': 500_000,
+    'max_bytes': 2 * 1024 ** 3,
+}
+
+# Cross-document GLiNER batching (enabled with --gliner-batch-size on main.py)
+# - batch_size: chunks per GLiNER forward pass
+# - docs_per_window: reports whose chunks are pooled and length-bucketed together
+gliner_batch_config = {
+    'batch_size': 8,
+    'docs_per_window': 64,
+}
+
+# In-memory memoization (--memo): raw findings per (engine, hash of a report or GLiNER chunk)
+memo_config = {
+    'max_entries': 200_000,
+}
+
+# Cross-document NLP batching (--stanza-batch-size, --spacy-batch-size): reports of a window are sent
+# through the engine's process_batch (Stanza bulk_process, spaCy nlp.pipe) via Presidio's BatchAnalyzerEngine
+# - batch_size: reports per batch
+# - n_process: spaCy nlp.pipe processes (only with --workers 1; pool workers cannot start child processes)
+# - docs_per_window: reports collected before a batch run
+nlp_batch_config = {
+    'stanza': {'batch_size': 32, 'docs_per_window': 64},
+    'spacy': {'batch_size': 64, 'n_process': 1, 'docs_per_window': 256},
+}
+
+# Local anonymization service (--serve, see server.py)
+# - max_batch / max_wait_ms: reports per micro-batch and how long a batch waits to fill
+# - max_queue: queued reports beyond which requests get 503 (backpressure)
+# - concurrency: requests handled at once (batches themselves run one at a time)
+server_config = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'max_batch': 32,
+    'max_wait_ms': 20,
+    'max_queue': 1024,
+    'concurrency': 64,
+    'max_body_bytes': 32 * 1024 ** 2,
+}
+
+# Parquet output (--format parquet): rows buffered per row group and the column compression codec
+parquet_config = {
+    'compression': 'zstd',
+    'row_group_size': 100_000,
+}
+
+# Runtime metrics (--metrics): snapshot file rewritten every `interval` seconds
+# (Prometheus text format for .prom/.txt paths, JSON otherwise)
+# - rate_window: seconds of completed reports used for the rolling docs/sec and ETA
+# - time_buckets / count_buckets: histogram bounds for *_seconds metrics and per-document counts
+metrics_config = {
+    'path': anonymize_location / 'Run_Metrics.prom',
+    'interval': 10.0,
+    'rate_window': 60.0,
+    'prefix': 'anonymize_pii',
+    'time_buckets': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    'count_buckets': (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+}
+
+
+def select_configs(names=None):
+    """Return the engine configs named in *names* (all of them when empty), in ``configs`` order."""
+    if not names:
+        return list(configs)
+    known = {config['name'] for config in configs}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown engines {unknown}. Available engines: {sorted(known)}")
+    return [config for config in configs if config['name'] in names]
+
+
+def __getattr__(name):
+    # Engine classes live in engines.py so importing config stays free of presidio/torch/gliner
+    if name in ('GlinerRecognizer', 'PassthroughNlpEngine', 'get_warm_engines'):
+        import engines
+        return getattr(engines, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 ##############################################################################################
@@ -142,6 +181,12 @@ replacement = 'REDACTED'
 # - headings_to_anonymize missing/empty means anonymize the full document.
 # - parser_config, expected_headings, and match_threshold are used for JSON and
 #   single-column mode only; they are ignored in multi-column mode.
+# - chunk_rows (CSV/Parquet only): read and parse the input this many rows at a
+#   time, loading only id_column and content_columns; None reads the whole file.
+# - workers (JSON only): parse on this many processes; reports that fail to parse
+#   are skipped and listed instead of aborting the run. Overridden by --parse-workers.
+# - cache_path: SQLite parse cache (see parse_cache_config); unchanged rows reuse
+#   their parsed output. Set by --parse-cache; CSV/Parquet input needs a unique id_column.
 
 headhunter_config = {
     'input_path': str(report_in / 'test_single_column_reports.csv'),
@@ -152,5 +197,14 @@ headhunter_config = {
     'match_threshold': 80,
     'headings_to_anonymize': ['clinical summary', 'treatment plan'],
     'separate_headings_into_reports': False,
+    'chunk_rows': None,
+    'workers': 1,
+    'cache_path': None,
+}
+
+# Persistent parse cache (--parse-cache): per-row parsed output keyed by row content and parse settings
+parse_cache_config = {
+    'path': root_dir / 'data' / 'cache' / 'parsed.sqlite',
+    'max_entries': 1_000_000,
 }
 
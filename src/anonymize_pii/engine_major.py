@@ -0,0 +1,232 @@
+"""Engine-major scheduling (``main.py --engine-major``).
+
+``RunIterator`` keeps every engine loaded for the whole run, so a process
+needs the memory of spaCy, Stanza and GLiNER together. Here each engine is
+loaded on its own and run over every pending report. Its filtered spans are
+written to ``<name>.spans.jsonl`` in a work directory and the engine is
+unloaded before the next one is loaded. Aggregation and anonymization then
+run from the saved spans, so peak memory is roughly that of the largest
+single model rather than the sum of all of them.
+
+Every pass reads the reports in the same order, so the span files line up
+with the reports line by line. Iterable (``--stream``) input is first
+written to the work directory so it can be read once per engine. Outputs,
+the run manifest and ``--resume`` work as in ``RunIterator``. The work
+directory is removed once the run completes.
+"""
+
+import gc
+import json
+import os
+import shutil
+import time
+
+from presidio_analyzer import RecognizerResult
+
+from config import configs, Entities, anonymize_location, gliner_batch_config, nlp_batch_config
+from engines import get_warm_engines
+from anonymizers import (
+    EntityScanner, aggregate_findings, anonymize_document, build_run_state, output_config_hash, _windows,
+)
+from batching import find_gliner_recognizer
+from checkpoint import RunManifest
+from outputs import make_output_writer
+from cache import format_cache_stats
+from memo import format_memo_stats
+from helpers import format_filter_stats
+from metrics import NULL_METRICS, RunMetrics
+from workers import peak_rss_mb
+
+
+WORK_DIR_NAME = 'engine_major'
+
+
+class _ReportStore:
+    """Pending ``(idx, text)`` reports that can be iterated once per engine pass, always in the same order."""
+
+    def __init__(self, items, work_dir, in_memory):
+        self.path = None
+        self.items = None
+        if in_memory:
+            self.items = list(items)
+            self.count = len(self.items)
+            return
+
+        self.path = os.path.join(work_dir, 'Reports.jsonl')
+        self.count = 0
+        with open(self.path, 'w', encoding='utf-8') as fh:
+            for idx, text in items:
+                fh.write(json.dumps({'id': idx, 'text': text}, ensure_ascii=False) + '\n')
+                self.count += 1
+
+    def __iter__(self):
+        if self.items is not None:
+            return iter(self.items)
+        return self._read()
+
+    def _read(self):
+        with open(self.path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                part = json.loads(line)
+                yield part['id'], part['text']
+
+
+def _dump_spans(spans):
+    return [[res.start, res.end, res.entity_type, res.score, res.recognition_metadata] for res in spans]
+
+
+def _load_spans(rows):
+    return [
+        RecognizerResult(entity_type=entity_type, start=start, end=end, score=score, recognition_metadata=metadata)
+        for start, end, entity_type, score, metadata in rows
+    ]
+
+
+def _unload(warm_engines, state):
+    """Release an engine pass: close its cache, shut GLiNER down and drop every reference to the models."""
+    if state['cache'] is not None:
+        print(format_cache_stats(state['cache'].stats()))
+        state['cache'].close()
+    if state['memo'] is not None:
+        print(format_memo_stats(state['memo'].stats()))
+    print(format_filter_stats(state['pii_filter'].stats()))
+
+    if 'GLiNER' in warm_engines:
+        find_gliner_recognizer(warm_engines['GLiNER']).shutdown()
+    warm_engines.clear()
+    state.clear()
+    gc.collect()
+
+
+def _scan_engine(config, reports, out_path, device, skiplist, mask_arg, options, metrics):
+    """Load one engine, write the filtered spans of every report to *out_path* and unload it."""
+    name = config['name']
+    started = time.perf_counter()
+    warm_engines = get_warm_engines([config], device)
+    load_seconds = time.perf_counter() - started
+
+    state = build_run_state(
+        warm_engines, skiplist, mask_arg, options['gliner_batch_size'], False, options['cache_path'], metrics,
+        options['nlp_batch'], options['detection_memo'], engine_configs=[config],
+    )
+    runner = state['batch_runners'].get(name)
+    window_size = 1
+    if runner is not None:
+        window_size = gliner_batch_config['docs_per_window'] if name == 'GLiNER' else nlp_batch_config[name]['docs_per_window']
+    scanner = EntityScanner(
+        warm_engines[name], state['pii_filter'], Entities, cache=state['cache'], engine_name=name, memo=state['memo'],
+    )
+
+    scan_started = time.perf_counter()
+    written = 0
+    with open(out_path, 'w', encoding='utf-8') as fh:
+        for window in _windows(reports, window_size):
+            batch_findings = None
+            if runner is not None:
+                with metrics.timer('batch_seconds', engine=name):
+                    batch_findings = runner.run(dict(window))
+            for idx, text in window:
+                if batch_findings is not None:
+                    spans = state['batch_scanner'].merge_chunk_results(text, batch_findings[idx])
+                    metrics.observe('chunks_per_document', len(batch_findings[idx]), engine=name)
+                else:
+                    with metrics.timer('engine_seconds', engine=name):
+                        spans = scanner.scan_spans(text, use_chunking=name == 'GLiNER')
+                    metrics.observe('chunks_per_document', scanner.chunks_scanned, engine=name)
+                metrics.observe('entities_per_document', len(spans), engine=name)
+                fh.write(json.dumps([idx, _dump_spans(spans)], default=str) + '\n')
+                written += 1
+    if written != reports.count:
+        raise ValueError(f"{name} wrote spans for {written} reports, expected {reports.count}")
+
+    print(
+        f"{name}: loaded in {load_seconds:.1f}s, scanned {reports.count} reports in "
+        f"{time.perf_counter() - scan_started:.1f}s (peak RSS so far {peak_rss_mb():.0f} MB)"
+    )
+    # The scanner and batch runner hold the models too; drop them before collecting
+    scanner = runner = None
+    _unload(warm_engines, state)
+
+
+def _anonymize_from_spans(reports, engine_names, span_paths, mask_arg, span_mask, writer, manifest, metrics):
+    """Aggregate the saved spans of every engine per report, anonymize and write the outputs."""
+    findings_scanner = EntityScanner(None, None, Entities)
+    span_files = [open(path, 'r', encoding='utf-8') for path in span_paths]
+    try:
+        # strict: a span file shorter or longer than the reports is an error, not a silent truncation
+        for (idx, text), *lines in zip(reports, *span_files, strict=True):
+            idx_dict = {}
+            doc_spans = {} if span_mask else None
+            for name, line in zip(engine_names, lines):
+                span_idx, rows = json.loads(line)
+                if str(span_idx) != str(idx):
+                    raise ValueError(f"{name} spans are out of step with the reports ({span_idx!r} vs {idx!r})")
+                spans = _load_spans(rows)
+                idx_dict[name] = findings_scanner.findings(text, spans)
+                if doc_spans is not None:
+                    doc_spans[name] = spans
+
+            doc_data = aggregate_findings(idx_dict, mask_arg)
+            results, anon_report = anonymize_document(text, doc_data, mask_arg, doc_spans, metrics)
+
+            if not metrics.enabled:
+                print(f"Anonymizing {idx}")
+            with metrics.timer('write_seconds'):
+                writer.write(idx, text, doc_data, anon_report, [result.to_dict() for result in results])
+            manifest.record(idx, text, writer.offsets())
+            metrics.document_done()
+    finally:
+        for fh in span_files:
+            fh.close()
+
+
+def RunEngineMajor(Reports, device, mask_arg, output_arg, skiplist, engine_configs=None, gliner_batch_size=None,
+                   stream=False, resume=False, cache_path=None, metrics_path=None, nlp_batch=None, detection_memo=False,
+                   output_format='json', span_mask=False):
+    """
+    Anonymize every report in *Reports* with one engine loaded at a time.
+
+    Arguments match ``RunIterator``; engines are loaded here, one per pass, from
+    *engine_configs* (default all ``configs``).
+    """
+    engine_configs = engine_configs or configs
+    config_hash = output_config_hash(
+        engine_configs, skiplist, mask_arg, output_arg, stream, detection_memo, output_format, span_mask,
+    )
+    manifest = RunManifest(anonymize_location, config_hash, resume=resume)
+    writer = make_output_writer(
+        output_arg, anonymize_location, stream=stream, resume_offsets=manifest.offsets, output_format=output_format
+    )
+
+    work_dir = os.path.join(anonymize_location, WORK_DIR_NAME)
+    os.makedirs(work_dir, exist_ok=True)
+    items = Reports.items() if isinstance(Reports, dict) else Reports
+    reports = _ReportStore(manifest.pending(items, writer), work_dir, in_memory=isinstance(Reports, dict))
+    metrics = NULL_METRICS
+    if metrics_path:
+        # Only pending reports count towards progress; those skipped on resume are already done
+        metrics = RunMetrics(metrics_path, total=reports.count)
+
+    options = {
+        'gliner_batch_size': gliner_batch_size,
+        'cache_path': cache_path,
+        'nlp_batch': nlp_batch,
+        'detection_memo': detection_memo,
+    }
+    engine_names = [config['name'] for config in engine_configs]
+    span_paths = [os.path.join(work_dir, f'{name}.spans.jsonl') for name in engine_names]
+    for config, span_path in zip(engine_configs, span_paths):
+        _scan_engine(config, reports, span_path, device, skiplist, mask_arg, options, metrics)
+
+    _anonymize_from_spans(reports, engine_names, span_paths, mask_arg, span_mask, writer, manifest, metrics)
+
+    with metrics.timer('output_close_seconds'):
+        writer.close()
+    if writer.resumable_after_close:
+        manifest.close(writer.offsets())
+    else:
+        manifest.discard()
+    metrics.close()
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("Anonymization Complete")
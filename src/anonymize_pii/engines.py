@@ -0,0 +1,227 @@
+"""Warm engine construction: Presidio analyzers for each config in ``config.configs``.
+
+Heavy libraries (torch, gliner) are imported only when an engine that needs
+them is built, so selecting a subset of engines keeps startup short.
+"""
+
+import copy
+import time
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult, AnalyzerEngine
+from presidio_analyzer.nlp_engine import NlpEngineProvider, NlpEngine, NlpArtifacts, StanzaNlpEngine
+from presidio_analyzer.nlp_engine.stanza_nlp_engine import load_pipeline
+from presidio_analyzer.recognizer_registry import RecognizerRegistry
+
+from config import Entities
+from gliner_onnx import load_gliner_onnx
+
+
+class GlinerRecognizer(EntityRecognizer):
+    def __init__(
+        self,
+        model_name: str,
+        labels: list[str],
+        device: str,
+        threshold: float = 0.5,
+        backend: str = 'torch',
+        onnx_dir=None,
+        quantize: bool = True,
+        **kwargs,
+    ):
+        """
+        :param backend: 'torch' runs the PyTorch model on *device*; 'onnx' runs an ONNX Runtime
+            export from *onnx_dir* (created on first use, int8-quantized when *quantize*).
+        """
+        if backend == 'onnx':
+            self.model = load_gliner_onnx(model_name, onnx_dir, quantize=quantize)
+        elif backend == 'torch':
+            from gliner import GLiNER as glmodel
+
+            self.model = glmodel.from_pretrained(model_name).to(device)
+        else:
+            raise ValueError(f"Unknown GLiNER backend '{backend}'. Use 'torch' or 'onnx'.")
+        self.backend = backend
+        self.labels = labels
+        self.threshold = threshold
+        super().__init__(supported_entities=labels, **kwargs)
+
+    def load(self) -> None:
+        pass
+
+    def analyze(self, text: str, entities: list[str], nlp_artifacts=None) -> list[RecognizerResult]:
+        gliner_results = self.model.predict_entities(text, self.labels, threshold=self.threshold, max_len=512)
+        return self._to_recognizer_results(gliner_results)
+
+    def analyze_batch(self, texts: list[str]) -> list[list[RecognizerResult]]:
+        """Run one batched forward pass over *texts*; results are returned in input order."""
+        if not texts:
+            return []
+        batch_results = self.model.batch_predict_entities(texts, self.labels, threshold=self.threshold, max_len=512)
+        return [self._to_recognizer_results(gliner_results) for gliner_results in batch_results]
+
+    def _to_recognizer_results(self, gliner_results) -> list[RecognizerResult]:
+        # Convert GLiNER output to Presidio RecognizerResult
+        return [
+            RecognizerResult(
+                entity_type=res["label"],
+                start=res["start"],
+                end=res["end"],
+                score=res["score"]
+            )
+            for res in gliner_results
+        ]
+
+    def shutdown(self):
+        # Move model to CPU and clear cache to free VRAM
+        if hasattr(self, 'model'):
+            if self.backend == 'onnx':
+                del self.model
+                return
+            import torch
+
+            self.model.to("cpu")
+            del self.model
+            torch.cuda.empty_cache()
+
+
+
+class PassthroughNlpEngine(NlpEngine):
+    """NLP engine that does no processing, for registries whose recognizers ignore nlp_artifacts (e.g. GLiNER)."""
+
+    def __init__(self, models=None):
+        self.languages = [model["lang_code"] for model in (models or [{"lang_code": "en"}])]
+
+    def load(self) -> None:
+        pass
+
+    def is_loaded(self) -> bool:
+        return True
+
+    def process_text(self, text: str, language: str) -> NlpArtifacts:
+        return NlpArtifacts(entities=[], tokens=[], tokens_indices=[], lemmas=[], nlp_engine=self, language=language)
+
+    def process_batch(self, texts, language: str, batch_size: int = 1, n_process: int = 1, **kwargs):
+        for text in texts:
+            yield text, self.process_text(text, language)
+
+    def is_stopword(self, word: str, language: str) -> bool:
+        return False
+
+    def is_punct(self, word: str, language: str) -> bool:
+        return False
+
+    def get_supported_entities(self) -> list[str]:
+        return []
+
+    def get_supported_languages(self) -> list[str]:
+        return self.languages
+
+
+
+class _ProcessedStanzaDocs:
+    """Stands in for the Stanza pipeline inside ``StanzaTokenizer``, returning documents already processed in bulk."""
+
+    def __init__(self, texts, documents):
+        self.documents = dict(zip(texts, documents))
+
+    def __call__(self, text):
+        return self.documents[text]
+
+
+class LeanStanzaNlpEngine(StanzaNlpEngine):
+    """
+    Stanza engine that loads *processors* (by default Presidio's ``tokenize,pos,lemma,ner``)
+    and runs ``process_batch`` through a single ``Pipeline.bulk_process`` call per batch.
+
+    Without the lemma processor Presidio's context enhancement has no lemmas to match against,
+    so add ``lemma`` to *processors* if context words should still boost pattern recognizer scores.
+    """
+
+    def __init__(self, models=None, processors='tokenize,pos,lemma,ner', **kwargs):
+        super().__init__(models=models, **kwargs)
+        self.processors = processors
+
+    def load(self) -> None:
+        self.nlp = {}
+        for model in self.models:
+            self._validate_model_params(model)
+            self.nlp[model["lang_code"]] = load_pipeline(
+                model["model_name"],
+                processors=self.processors,
+                download_method="DOWNLOAD_RESOURCES" if self.download_if_missing else None,
+            )
+
+    def process_batch(self, texts, language: str, batch_size: int = 1, n_process: int = 1, as_tuples: bool = False):
+        import stanza
+
+        tokenizer = self.nlp[language].tokenizer
+        items = list(texts)
+        batch_size = max(1, int(batch_size))
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            batch_texts = [str(item[0] if as_tuples else item) for item in batch]
+
+            # Blank texts never reach the Stanza pipeline (StanzaTokenizer handles them itself)
+            to_process = [text for text in batch_texts if text.strip()]
+            processed = tokenizer.snlp.bulk_process([stanza.Document([], text=text) for text in to_process])
+
+            # Reuse StanzaTokenizer's Stanza-to-spaCy conversion on the bulk-processed documents
+            converter = copy.copy(tokenizer)
+            converter.snlp = _ProcessedStanzaDocs(to_process, processed)
+            for item, text in zip(batch, batch_texts):
+                nlp_artifacts = self._doc_to_nlp_artifact(converter(text), language)
+                if as_tuples:
+                    yield text, nlp_artifacts, item[1]
+                else:
+                    yield text, nlp_artifacts
+
+
+
+def get_warm_engines(configs, device, timings=None):
+    """
+    Load an AnalyzerEngine for every config in *configs*.
+
+    If *timings* is a dict, the load time in seconds of each engine is stored under its name.
+    """
+    warm_engines = {}
+    for config in configs:
+        name = config.get('name')
+        started = time.perf_counter()
+        
+        # Pass the config dict directly to the constructor
+        # Note: config.get('config') is the dictionary defined in your 'spacy' or 'stanza' variables
+        nlp_configuration = config.get('config')
+        if nlp_configuration.get('nlp_engine_name') == 'passthrough':
+            engine = PassthroughNlpEngine(models=nlp_configuration.get('models'))
+        elif nlp_configuration.get('nlp_engine_name') == 'stanza':
+            engine = LeanStanzaNlpEngine(
+                models=nlp_configuration.get('models'),
+                processors=config.get('processors') or 'tokenize,pos,lemma,ner',
+            )
+            engine.load()
+        else:
+            provider = NlpEngineProvider(nlp_configuration=nlp_configuration)
+            engine = provider.create_engine()
+        registry = RecognizerRegistry()
+
+        if name == 'GLiNER':
+            onnx_options = config.get('onnx') or {}
+            gliner_rec = GlinerRecognizer(
+                model_name=config.get('external_model'), 
+                labels=Entities, 
+                device=device,
+                backend=config.get('backend', 'torch'),
+                onnx_dir=onnx_options.get('dir'),
+                quantize=onnx_options.get('quantize', True),
+            )
+            registry.add_recognizer(gliner_rec)
+            warm_engines[name] = AnalyzerEngine(nlp_engine=engine, registry=registry)
+        else:
+            # Load default recognizers (regex, etc) for SpaCy/Stanza
+            registry.load_predefined_recognizers()
+            warm_engines[name] = AnalyzerEngine(nlp_engine=engine, registry=registry)
+
+        if timings is not None:
+            timings[name] = time.perf_counter() - started
+            
+    return warm_engines
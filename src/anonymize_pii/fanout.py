@@ -0,0 +1,37 @@
+"""Engine-parallel execution of a single document.
+
+Each warm engine gets one dedicated thread, so a document can be sent to the
+spaCy, Stanza and GLiNER engines at once while each model is only ever called
+from its own thread. The heavy work in all three releases the GIL.
+
+torch's intra-op thread count is process-wide, so it cannot be budgeted per
+engine thread. Instead one budget for the whole process is set once, before
+the engine threads start.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers import set_torch_threads
+
+
+class EngineFanout:
+    def __init__(self, engine_names, torch_threads=None):
+        """
+        :param engine_names: Names of the engines (config 'name') to create threads for.
+        :param torch_threads: Optional process-wide torch intra-op thread budget shared by all
+            engines, set once here; None leaves torch's default.
+        """
+        set_torch_threads(torch_threads)
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"engine-{name}")
+            for name in engine_names
+        }
+
+    def run(self, tasks):
+        """Run ``{name: callable}`` concurrently and return ``{name: result}`` in the same order."""
+        futures = {name: self._executors[name].submit(task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
@@ -0,0 +1,55 @@
+"""ONNX export and dynamic int8 quantization of GLiNER models.
+
+The export is GLiNER's own ``export_to_onnx``: it traces the span model with
+its ONNX wrapper and input spec (TorchScript exporter, ``dynamo=False``) and
+optionally quantizes it with ONNX Runtime's ``quantize_dynamic``. The model's
+tokenizer and config are saved next to it, so the resulting directory loads
+with ``GLiNER.from_pretrained(out_dir, load_onnx_model=True, onnx_model_file=...)``.
+"""
+
+from pathlib import Path
+
+
+ONNX_MODEL_FILE = 'model.onnx'
+QUANTIZED_MODEL_FILE = 'model_quantized.onnx'
+
+
+def export_gliner_onnx(model_name: str, out_dir, quantize: bool = True) -> Path:
+    """
+    Export *model_name* to ONNX in *out_dir* (and an int8 copy when *quantize*), unless already there.
+
+    Returns the path of the model file that should be loaded; that is the
+    unquantized export if GLiNER could not quantize it.
+    """
+    out_dir = Path(out_dir)
+    onnx_path = out_dir / ONNX_MODEL_FILE
+    quantized_path = out_dir / QUANTIZED_MODEL_FILE
+    if quantize and quantized_path.exists():
+        return quantized_path
+    if not quantize and onnx_path.exists():
+        return onnx_path
+
+    from gliner import GLiNER as glmodel
+
+    model = glmodel.from_pretrained(model_name, load_tokenizer=True)
+    model.save_pretrained(out_dir)
+    paths = model.export_to_onnx(
+        out_dir,
+        onnx_filename=ONNX_MODEL_FILE,
+        quantized_filename=QUANTIZED_MODEL_FILE,
+        quantize=quantize,
+    )
+    return Path(paths['quantized_path'] or paths['onnx_path'])
+
+
+def load_gliner_onnx(model_name: str, onnx_dir, quantize: bool = True):
+    """Load the ONNX GLiNER model from *onnx_dir*, exporting it first if it is missing."""
+    from gliner import GLiNER as glmodel
+
+    model_path = export_gliner_onnx(model_name, onnx_dir, quantize=quantize)
+    return glmodel.from_pretrained(
+        str(Path(onnx_dir)),
+        load_onnx_model=True,
+        load_tokenizer=True,
+        onnx_model_file=model_path.name,
+    )
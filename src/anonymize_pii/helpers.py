@@ -2,17 +2,108 @@
 import os
 import json
 import re
+from functools import lru_cache
 
 from pathlib import Path
 
 
 
 def LoadReports(fp):
+    if Path(fp).suffix.lower() == '.jsonl':
+        return dict(IterReports(fp))
     with open(fp, 'r') as file:
         # Deserialize the file content into a Python dictionary
         Corpus = json.load(file)
     return Corpus
 
+def IterReports(fp, chunk_size=1 << 20):
+    """
+    Lazily yield ``(id, text)`` pairs from a reports file without loading it whole.
+
+    ``.jsonl`` files hold one report per line, either ``{"id": ..., "text": ...}``
+    or a single-key ``{id: text}`` object. ``.json`` files must be a top-level
+    ``{id: text}`` object and are read incrementally in *chunk_size* pieces.
+    """
+    fp = Path(fp)
+    if fp.suffix.lower() == '.jsonl':
+        with open(fp, 'r', encoding='utf-8') as file:
+            for line_no, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"{fp}:{line_no}: expected a JSON object, got {type(record).__name__}")
+                if 'id' in record and 'text' in record:
+                    yield str(record['id']), record['text']
+                else:
+                    yield from record.items()
+    else:
+        with open(fp, 'r', encoding='utf-8') as file:
+            yield from _iter_json_object(file, chunk_size)
+
+
+def _iter_json_object(file, chunk_size):
+    """Incrementally parse a top-level JSON object, yielding its ``(key, value)`` pairs."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+
+    def read_more():
+        nonlocal buf, pos, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        # Drop the consumed prefix so the buffer only ever holds roughly one value
+        buf, pos = buf[pos:] + chunk, 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            read_more()
+
+    def expect(char):
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] != char:
+            found = buf[pos] if pos < len(buf) else 'end of file'
+            raise ValueError(f"Reports JSON must be a {{id: text}} mapping: expected '{char}', found {found!r}")
+        pos += 1
+
+    def decode():
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            read_more()
+
+    expect('{')
+    skip_whitespace()
+    if pos < len(buf) and buf[pos] == '}':
+        return
+    while True:
+        key = decode()
+        if not isinstance(key, str):
+            raise ValueError(f"Reports JSON keys must be strings, got {type(key).__name__}")
+        expect(':')
+        yield key, decode()
+        skip_whitespace()
+        if pos < len(buf) and buf[pos] == ',':
+            pos += 1
+            continue
+        expect('}')
+        return
+
+
 def CreateOutputDir(savedir):
     try:
         os.mkdir(savedir)
@@ -26,14 +117,32 @@ def CreateOutputDir(savedir):
         print(f"An OS error occurred: {e}")
 
 def SaveOutputs(data, filename):
+    # Write to a temporary file and rename, so an interrupted run never leaves a half-written file
+    # Returns True once the file is in place, False if it could not be written
+    tmp_filename = f'{filename}.tmp'
     try:
-        with open(filename, 'w') as json_file:
+        with open(tmp_filename, 'w') as json_file:
             json.dump(data, json_file, indent=4)
+        os.replace(tmp_filename, filename)
         #print(f"Dictionary successfully saved to {filename}")
+        return True
     except TypeError as e:
         print(f"Error: Unable to serialize data. {e}")
     except IOError as e:
         print(f"Error: Could not open or write to file. {e}")
+    return False
+
+
+
+def set_torch_threads(threads):
+    """Cap torch intra-op threads for the calling process/thread; no-op if *threads* is None or torch is absent."""
+    if not threads:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
 
 
 
@@ -70,14 +179,21 @@ def load_skiplist_from_directory(directory_path, initial_list=None):
 
 
 class PIIFilter:
-    def __init__(self, skiplist, timewords, generalwords):
+    # Characters timewords are split on: the space-to-slash range ( !"#$%&'()*+,-./)
+    _TIMEWORD_SPLIT_RE = re.compile(r'[ -/]+')
+
+    def __init__(self, skiplist, timewords, generalwords, cache_size=65536):
         """
         Initialize with the specific lists used for filtering.
         Converting them to sets makes lookups much faster.
+
+        Every list and every checked text is case-folded the same way, and
+        verdicts are memoized per distinct text in a bounded LRU cache of *cache_size*.
         """
-        self.skiplist = {word.lower() for word in skiplist}
-        self.timewords = set(timewords)
-        self.generalwords = set(generalwords)
+        self.skiplist = {word.casefold() for word in skiplist}
+        self.timewords = {word.casefold() for word in timewords}
+        self.generalwords = {word.casefold() for word in generalwords}
+        self._cached_is_pii = lru_cache(maxsize=cache_size)(self._evaluate)
 
     def is_pii(self, text):
         """
@@ -85,26 +201,51 @@ class PIIFilter:
         Returns True if the text SHOULD be treated as PII.
         Returns False if it matches any of your 'clean' criteria.
         """
-        if self.check_skiplist(text):
+        return self._cached_is_pii(text)
+
+    def is_pii_many(self, texts):
+        """Return ``is_pii`` for every text in *texts*, in order."""
+        cached_is_pii = self._cached_is_pii
+        return [cached_is_pii(text) for text in texts]
+
+    def _evaluate(self, text):
+        folded = text.casefold()
+        if folded in self.skiplist:
             return False
-        if self.has_timewords(text):
+        if not self.timewords.isdisjoint(self._TIMEWORD_SPLIT_RE.split(folded)):
             return False
-        if self.has_general_words(text):
+        if not self.generalwords.isdisjoint(folded.split()):
             return False
         return True
 
     def has_timewords(self, text):
         # Splits by characters and counts occurrences of timewords
-        words = re.split(r'[ -/]+', text.lower())
-        return any(word in self.timewords for word in words)
+        return not self.timewords.isdisjoint(self._TIMEWORD_SPLIT_RE.split(text.casefold()))
 
     def has_general_words(self, text):
         # Standard split and count occurrences of generalwords
-        return any(word in self.generalwords for word in text.lower().split())
+        return not self.generalwords.isdisjoint(text.casefold().split())
 
     def check_skiplist(self, text):
         # Returns True if text is in the list
-        return text.lower() in self.skiplist
+        return text.casefold() in self.skiplist
+
+    def stats(self):
+        info = self._cached_is_pii.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+            'entries': info.currsize,
+        }
+
+
+def format_filter_stats(stats):
+    return (
+        f"PII filter cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.1%} hit rate)"
+    )
 
 
 
@@ -1,31 +1,143 @@
 
 import argparse
-import torch
+import time
+from contextlib import contextmanager
 
-from config import report_location, anonymize_location, get_warm_engines, configs, skiplist_dir, headhunter_config 
-from helpers import CreateOutputDir, LoadReports, load_skiplist_from_directory
-from anonymizers import RunIterator
-from parsing import parse_reports
+from config import report_location, anonymize_location, configs, select_configs, skiplist_dir, headhunter_config, gliner_batch_config, nlp_batch_config, detection_cache_config, metrics_config, parse_cache_config
+from helpers import CreateOutputDir, LoadReports, IterReports, load_skiplist_from_directory
+
+# Heavy modules (presidio, torch, gliner, headhunter) are imported inside main() only when needed
+
+
+@contextmanager
+def timed(timings, label):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[label] = time.perf_counter() - started
+
+
+def detect_device(engine_configs):
+    # Only model-backed engines (GLiNER) use the device, so torch is not imported otherwise
+    if not any(config.get('external_model') for config in engine_configs):
+        return "cpu"
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def print_startup_timings(timings):
+    breakdown = ", ".join(f"{label} {seconds:.2f}s" for label, seconds in timings.items())
+    print(f"Startup: {breakdown} (total {sum(timings.values()):.2f}s)")
 
 
 def main(**kwargs):
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
+    timings = {}
+    engine_names = [name.strip() for name in (kwargs.get('engines') or '').split(',') if name.strip()]
+    engine_configs = select_configs(engine_names)
+    if kwargs.get('stanza_processors'):
+        # Copies, so the override also reaches the cache identity and run config hash but not config.stanza itself
+        engine_configs = [
+            dict(config, processors=kwargs['stanza_processors']) if config['name'] == 'stanza' else config
+            for config in engine_configs
+        ]
+    with timed(timings, 'device'):
+        device = detect_device(engine_configs)
 
     mask_arg = kwargs.get('mask')
     output_arg = kwargs.get('output')
-    parse_first = kwargs.get('parse')
+    output_format = kwargs.get('format') or 'json'
+    parse_only = kwargs.get('parse_only')
+    parse_first = kwargs.get('parse') or parse_only
+    gliner_batch_size = kwargs.get('gliner_batch_size')
+    nlp_batch = {}
+    if kwargs.get('stanza_batch_size'):
+        nlp_batch['stanza'] = {'batch_size': kwargs['stanza_batch_size']}
+    if kwargs.get('spacy_batch_size'):
+        spacy_n_process = kwargs.get('spacy_n_process') or 1
+        if spacy_n_process > 1 and (kwargs.get('workers') or 1) > 1:
+            print("--spacy-n-process is ignored with --workers > 1 (pool workers cannot start child processes)")
+            spacy_n_process = 1
+        nlp_batch['spacy'] = {'batch_size': kwargs['spacy_batch_size'], 'n_process': spacy_n_process}
+    workers = kwargs.get('workers') or 1
+    worker_load = kwargs.get('worker_load')
+    if device == 'cuda' and workers > 1 and worker_load != 'per-worker' and not kwargs.get('serve'):
+        # A forked child cannot re-initialize CUDA, so each (spawned) worker loads its own engines instead
+        print("--worker-load fork is not supported on CUDA; loading engines per worker")
+        worker_load = 'per-worker'
+    engine_parallel = kwargs.get('engine_parallel')
+    stream = kwargs.get('stream')
+    resume = kwargs.get('resume')
+    cache_path = kwargs.get('cache')
+    metrics_path = kwargs.get('metrics')
+    detection_memo = kwargs.get('memo')
+    span_mask = kwargs.get('span_mask')
+    input_path = kwargs.get('input') or report_location
     skiplist = load_skiplist_from_directory(skiplist_dir)
 
     CreateOutputDir(anonymize_location)
 
     if parse_first:
-        Reports = parse_reports(headhunter_config)
+        with timed(timings, 'parse'):
+            from parsing import parse_reports
+            parse_config = dict(headhunter_config)
+            if kwargs.get('parse_workers'):
+                parse_config['workers'] = kwargs['parse_workers']
+            if kwargs.get('parse_cache'):
+                parse_config['cache_path'] = kwargs['parse_cache']
+            Reports = parse_reports(parse_config)
+        if parse_only:
+            print(f"Parsed {len(Reports)} reports")
+            print_startup_timings(timings)
+            return
+    elif kwargs.get('serve'):
+        # Reports arrive over the service's HTTP interface instead
+        Reports = None
+    elif stream:
+        # Reports are read lazily and merged output is appended as JSONL per report
+        Reports = IterReports(input_path)
     else:
-        Reports = LoadReports(report_location)
-
-    warm_engines = get_warm_engines(configs, device)
-    RunIterator(Reports, device, mask_arg, output_arg, warm_engines, skiplist)
+        Reports = LoadReports(input_path)
+
+    if kwargs.get('engine_major'):
+        # One engine in memory at a time: each is loaded, run over every report and unloaded (see engine_major.py)
+        from engine_major import RunEngineMajor
+        if workers > 1 or engine_parallel:
+            print("--workers and --engine-parallel are ignored with --engine-major")
+        print_startup_timings(timings)
+        RunEngineMajor(Reports, device, mask_arg, output_arg, skiplist, engine_configs=engine_configs,
+                       gliner_batch_size=gliner_batch_size, stream=stream, resume=resume, cache_path=cache_path,
+                       metrics_path=metrics_path, nlp_batch=nlp_batch, detection_memo=detection_memo,
+                       output_format=output_format, span_mask=span_mask)
+        return
+
+    with timed(timings, 'imports'):
+        from engines import get_warm_engines
+        from anonymizers import RunIterator
+
+    # 'per-worker' leaves engine loading to each pool process; otherwise load once here (shared by forked workers)
+    warm_engines = None
+    if kwargs.get('serve') or not (workers > 1 and worker_load == 'per-worker'):
+        engine_timings = {}
+        warm_engines = get_warm_engines(engine_configs, device, timings=engine_timings)
+        timings.update((f"engine {name}", seconds) for name, seconds in engine_timings.items())
+    print_startup_timings(timings)
+
+    if kwargs.get('serve'):
+        # Engines stay resident and requests are micro-batched (see server.py)
+        from server import serve
+        serve(warm_engines, skiplist, mask_arg, host=kwargs.get('host'), port=kwargs.get('port'),
+              unix_socket=kwargs.get('socket'), gliner_batch_size=gliner_batch_size, engine_parallel=engine_parallel,
+              cache_path=cache_path, nlp_batch=nlp_batch, detection_memo=detection_memo, span_mask=span_mask,
+              engine_configs=engine_configs, max_batch=kwargs.get('max_batch'), max_wait_ms=kwargs.get('max_wait_ms'))
+        return
+
+    RunIterator(Reports, device, mask_arg, output_arg, warm_engines, skiplist, gliner_batch_size=gliner_batch_size, workers=workers,
+                engine_parallel=engine_parallel, stream=stream, resume=resume,
+                cache_path=cache_path, engine_configs=engine_configs, metrics_path=metrics_path,
+                nlp_batch=nlp_batch, detection_memo=detection_memo,
+                output_format=output_format, span_mask=span_mask)
 
 
 
@@ -34,7 +146,54 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--mask", type = str, default = "entity")
     parser.add_argument("--output", type = str, default = "merged")
+    parser.add_argument("--format", type=str, default="json", choices=["json", "parquet"],
+                        help="Output file format; parquet writes compressed PII_Log/Iterator/Anonymized_Reports tables.")
     parser.add_argument("--parse", action="store_true", help="Parse input with headhunter before anonymization.")
+    parser.add_argument("--parse-only", action="store_true", help="Parse input with headhunter and exit without loading any engine.")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Processes for headhunter parsing of JSON input (default: headhunter_config['workers']).")
+    parser.add_argument("--parse-cache", type=str, nargs="?", default=None, const=str(parse_cache_config['path']),
+                        help="Reuse parsed output for unchanged input rows (optional SQLite path).")
+    parser.add_argument("--engines", type=str, default=None,
+                        help=f"Comma-separated engines to load and run (default: all of {[config['name'] for config in configs]}).")
+    parser.add_argument("--gliner-batch-size", type=int, nargs="?", default=0, const=gliner_batch_config['batch_size'],
+                        help="Batch GLiNER chunks across reports (flag alone uses gliner_batch_config; 0 disables).")
+    parser.add_argument("--stanza-batch-size", type=int, nargs="?", default=0, const=nlp_batch_config['stanza']['batch_size'],
+                        help="Bulk-process reports through Stanza in batches (flag alone uses nlp_batch_config; 0 disables).")
+    parser.add_argument("--stanza-processors", type=str, nargs="?", default=None, const="tokenize,ner",
+                        help="Load only these Stanza processors (flag alone: tokenize,ner; skips pos/lemma, so no context boosts).")
+    parser.add_argument("--spacy-batch-size", type=int, nargs="?", default=0, const=nlp_batch_config['spacy']['batch_size'],
+                        help="Stream reports through spaCy nlp.pipe in batches (flag alone uses nlp_batch_config; 0 disables).")
+    parser.add_argument("--spacy-n-process", type=int, default=nlp_batch_config['spacy']['n_process'],
+                        help="Processes for spaCy nlp.pipe with --spacy-batch-size.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes for anonymization.")
+    parser.add_argument("--worker-load", type=str, default="fork", choices=["fork", "per-worker"],
+                        help="Load engines once before forking (shared copy-on-write) or once inside each spawned worker (forced on CUDA).")
+    parser.add_argument("--engine-parallel", action="store_true",
+                        help="Run the spaCy, Stanza and GLiNER engines concurrently on each report.")
+    parser.add_argument("--input", type=str, default=None, help="Reports file (.json or .jsonl); defaults to data/raw/Reports.json.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read reports lazily and append merged output to JSONL files as each report finishes.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip reports the run manifest already records as finished with the same text and config.")
+    parser.add_argument("--cache", type=str, nargs="?", default=None, const=str(detection_cache_config['path']),
+                        help="Reuse raw engine detections from an on-disk SQLite cache (flag alone uses detection_cache_config).")
+    parser.add_argument("--memo", action="store_true",
+                        help="Reuse engine findings for reports and GLiNER chunks already analyzed earlier in the run.")
+    parser.add_argument("--span-mask", action="store_true",
+                        help="Mask only the spans the engines detected, in one pass, instead of every occurrence of the detected strings.")
+    parser.add_argument("--engine-major", action="store_true",
+                        help="Load one engine at a time, run it over every report and unload it before the next.")
+    parser.add_argument("--serve", action="store_true",
+                        help="Keep the engines loaded and serve anonymization over local HTTP (see server.py).")
+    parser.add_argument("--host", type=str, default=None, help="--serve host (default: server_config['host']).")
+    parser.add_argument("--port", type=int, default=None, help="--serve port (default: server_config['port']).")
+    parser.add_argument("--socket", type=str, default=None, help="--serve on this Unix socket instead of TCP.")
+    parser.add_argument("--max-batch", type=int, default=None, help="--serve reports per micro-batch.")
+    parser.add_argument("--max-wait-ms", type=float, default=None, help="--serve wait for a micro-batch to fill.")
+    parser.add_argument("--metrics", type=str, nargs="?", default=None, const=str(metrics_config['path']),
+                        help="Write engine/anonymize/write timings and progress to this file periodically "
+                             "(.prom for Prometheus text, otherwise JSON; flag alone uses metrics_config).")
     args = parser.parse_args()
 
     main(**vars(args))
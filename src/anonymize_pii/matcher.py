@@ -0,0 +1,110 @@
+"""Compiled deny-list matcher for the anonymization step.
+
+Builds a character trie from the ``Deny``/``Redact`` output of
+``process_full_document`` and scans the report once, emitting Presidio
+``RecognizerResult`` spans that can be handed straight to ``AnonymizerEngine``.
+Matching mirrors Presidio's deny-list ``PatternRecognizer`` (case-insensitive,
+bounded by non-word characters) but resolves overlaps leftmost-longest and never
+loads an NLP engine.
+"""
+
+import re
+
+from presidio_analyzer import RecognizerResult
+
+
+_TERMINAL = None
+_CANDIDATE_START_RE = re.compile(r"(?<!\w).", re.DOTALL)
+
+
+def _fold(text: str) -> str:
+    """Lowercase *text* without changing its length, so offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def _is_word_char(ch: str) -> bool:
+    """Return True if *ch* is matched by ``\\w`` (the deny-list regex boundary)."""
+    return ch.isalnum() or ch == "_"
+
+
+class DenyListMatcher:
+    def __init__(self, term_types: dict[str, str], score: float = 1.0):
+        """
+        :param term_types: Mapping of deny term -> entity type to emit.
+        :param score: Score assigned to every match (Presidio's deny-list default is 1.0).
+        """
+        self.score = score
+        self._root: dict = {}
+        for term, entity_type in term_types.items():
+            self._add(term, entity_type)
+
+    @classmethod
+    def from_deny_map(cls, deny_map: dict[str, list[str]], score: float = 1.0) -> "DenyListMatcher":
+        """Build from ``{entity_type: [terms]}`` (the ``Deny`` map). The first type seen for a term wins."""
+        term_types: dict[str, str] = {}
+        for entity_type, terms in deny_map.items():
+            for term in terms or []:
+                term_types.setdefault(term, entity_type)
+        return cls(term_types, score=score)
+
+    @classmethod
+    def from_terms(cls, terms: list[str], entity_type: str, score: float = 1.0) -> "DenyListMatcher":
+        """Build from a flat term list (the ``Redact`` list) mapped to a single entity type."""
+        return cls({term: entity_type for term in terms}, score=score)
+
+    def _add(self, term: str, entity_type: str) -> None:
+        if not term:
+            return
+        node = self._root
+        for ch in _fold(term):
+            node = node.setdefault(ch, {})
+        node.setdefault(_TERMINAL, entity_type)
+
+    def analyze(self, text: str) -> list[RecognizerResult]:
+        """Return non-overlapping, leftmost-longest deny-list matches in *text*."""
+        if not self._root or not text:
+            return []
+
+        folded = _fold(text)
+        root = self._root
+        length = len(text)
+        results: list[RecognizerResult] = []
+        last_end = 0
+
+        for candidate in _CANDIDATE_START_RE.finditer(folded):
+            start = candidate.start()
+            if start < last_end or folded[start] not in root:
+                continue
+
+            node = root
+            best_end = -1
+            best_type = None
+            pos = start
+            while pos < length:
+                node = node.get(folded[pos])
+                if node is None:
+                    break
+                pos += 1
+                if _TERMINAL in node and (pos == length or not _is_word_char(text[pos])):
+                    best_end = pos
+                    best_type = node[_TERMINAL]
+
+            if best_type is not None:
+                results.append(
+                    RecognizerResult(
+                        entity_type=best_type,
+                        start=start,
+                        end=best_end,
+                        score=self.score,
+                        recognition_metadata={
+                            RecognizerResult.RECOGNIZER_NAME_KEY: "DenyListMatcher",
+                            RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: "DenyListMatcher",
+                        },
+                    )
+                )
+                last_end = best_end
+
+        return results
@@ -0,0 +1,70 @@
+"""In-memory memoization of raw engine detections (``--memo``).
+
+``EntityScanner`` looks up every text it would send to an engine -- the whole
+report for spaCy and Stanza, each 384-token chunk for GLiNER -- under the
+engine name and a hash of the text, and stores the raw results on a miss.
+The units are the ones a normal scan analyzes, so memoized output is the same
+as a full analysis: engines keep their whole-report context (Presidio context
+boosts) and GLiNER its packed chunks. Repeated reports, and GLiNER chunks of
+template text repeated across reports, are analyzed once.
+
+It is the in-memory, per-run counterpart of the on-disk ``DetectionCache``
+(``--cache``): like it, it stores results for whole analyzed texts and never
+splits them further. Entries are evicted least-recently-used beyond ``max_entries``.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class DetectionMemo:
+    def __init__(self, max_entries=200_000):
+        """
+        :param max_entries: Evict least recently used texts beyond this count.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(engine_name, text):
+        return engine_name, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, engine_name, text):
+        """Return memoized results for *text* from *engine_name*, or None on a miss."""
+        key = self._key(engine_name, text)
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return results
+
+    def put(self, engine_name, text, results):
+        key = self._key(engine_name, text)
+        with self._lock:
+            self._entries[key] = list(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+        }
+
+
+def format_memo_stats(stats):
+    return (
+        f"Detection memo: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.1%} hit rate)"
+    )
@@ -0,0 +1,253 @@
+"""Runtime metrics for ``RunIterator`` (enabled with ``--metrics``).
+
+``RunMetrics`` keeps histograms of per-engine scan time, ``AnonymizeText`` time,
+output write time, and chunks/entities per document, plus a rolling docs/sec
+rate with an ETA. Every ``interval`` seconds it rewrites a snapshot file that a
+local scraper can read: Prometheus text format for ``.prom``/``.txt`` paths,
+JSON otherwise.
+
+``NULL_METRICS`` is the default everywhere; its methods do nothing, so disabled
+instrumentation costs one method call per measurement. Worker processes
+collect into their own ``RunMetrics`` and the parent merges what they ``drain``.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+
+from config import metrics_config
+
+
+_NULL_TIMER = nullcontext()
+
+
+class NullMetrics:
+    enabled = False
+
+    def timer(self, name, **labels):
+        return _NULL_TIMER
+
+    def observe(self, name, value, **labels):
+        pass
+
+    def document_done(self):
+        pass
+
+    def drain(self):
+        return None
+
+    def merge(self, drained):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'started')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``counts[i]`` holds observations <= ``bounds[i]`` (last slot is +Inf)."""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, counts, total, count):
+        for i, bucket_count in enumerate(counts):
+            self.counts[i] += bucket_count
+        self.total += total
+        self.count += count
+
+    def quantile(self, q):
+        """Upper bucket bound containing the *q* quantile (None when empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds + (float('inf'),), self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class RunMetrics:
+    def __init__(self, path=None, interval=None, total=None, rate_window=None):
+        """
+        :param path: Snapshot file to rewrite periodically (None collects only, e.g. in workers).
+        :param interval: Seconds between snapshots (defaults to metrics_config).
+        :param total: Number of reports this run will process (excluding any skipped on resume), if known, for the ETA.
+        :param rate_window: Seconds of completions the rolling docs/sec is computed over.
+        """
+        self.enabled = True
+        self.path = path
+        self.interval = metrics_config['interval'] if interval is None else interval
+        self.rate_window = metrics_config['rate_window'] if rate_window is None else rate_window
+        self.total = total
+        self.documents = 0
+        self.started = time.time()
+        self._histograms = {}
+        self._completions = deque()
+        self._last_export = time.monotonic()
+        self._lock = threading.Lock()
+
+    def timer(self, name, **labels):
+        return _Timer(self, name, labels)
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                bounds = metrics_config['time_buckets'] if name.endswith('_seconds') else metrics_config['count_buckets']
+                histogram = self._histograms[key] = Histogram(bounds)
+            histogram.observe(value)
+
+    def drain(self):
+        """Return and reset the histograms collected so far (picklable, for ``merge`` in another process)."""
+        with self._lock:
+            drained = {key: (hist.bounds, hist.counts, hist.total, hist.count) for key, hist in self._histograms.items()}
+            self._histograms = {}
+        return drained
+
+    def merge(self, drained):
+        if not drained:
+            return
+        with self._lock:
+            for key, (bounds, counts, total, count) in drained.items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(bounds)
+                histogram.merge(counts, total, count)
+
+    def document_done(self):
+        """Count a finished report; write a snapshot when the export interval has elapsed."""
+        now = time.monotonic()
+        self.documents += 1
+        self._completions.append(now)
+        while self._completions and now - self._completions[0] > self.rate_window:
+            self._completions.popleft()
+        if self.path and now - self._last_export >= self.interval:
+            self._last_export = now
+            self.export()
+            print(format_progress(self.progress()))
+
+    def docs_per_second(self):
+        if len(self._completions) < 2:
+            return 0.0
+        span = self._completions[-1] - self._completions[0]
+        return (len(self._completions) - 1) / span if span > 0 else 0.0
+
+    def progress(self):
+        rate = self.docs_per_second()
+        remaining = None if self.total is None else max(self.total - self.documents, 0)
+        return {
+            'documents': self.documents,
+            'total': self.total,
+            'docs_per_second': rate,
+            'eta_seconds': remaining / rate if remaining is not None and rate else None,
+            'elapsed_seconds': time.time() - self.started,
+        }
+
+    def snapshot(self):
+        with self._lock:
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': hist.count,
+                    'sum': hist.total,
+                    'p50': hist.quantile(0.5),
+                    'p95': hist.quantile(0.95),
+                    'buckets': dict(zip([str(bound) for bound in hist.bounds] + ['+Inf'], hist.counts)),
+                }
+                for (name, labels), hist in sorted(self._histograms.items())
+            ]
+        return {'timestamp': time.time(), 'progress': self.progress(), 'histograms': histograms}
+
+    def export(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if str(self.path).endswith(('.prom', '.txt')):
+            content = self._prometheus_text()
+        else:
+            content = json.dumps(self.snapshot(), indent=4)
+        # Replace atomically so a scraper never reads a half-written file
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as fh:
+            fh.write(content)
+        os.replace(tmp_path, self.path)
+
+    def _prometheus_text(self):
+        prefix = metrics_config['prefix']
+        progress = self.progress()
+        lines = [
+            f'# TYPE {prefix}_documents_total counter',
+            f'{prefix}_documents_total {progress["documents"]}',
+            f'# TYPE {prefix}_docs_per_second gauge',
+            f'{prefix}_docs_per_second {progress["docs_per_second"]}',
+        ]
+        if progress['eta_seconds'] is not None:
+            lines += [f'# TYPE {prefix}_eta_seconds gauge', f'{prefix}_eta_seconds {progress["eta_seconds"]}']
+
+        with self._lock:
+            by_name = {}
+            for (name, labels), hist in sorted(self._histograms.items()):
+                by_name.setdefault(name, []).append((labels, hist))
+            for name, series in by_name.items():
+                metric = f'{prefix}_{name}'
+                lines.append(f'# TYPE {metric} histogram')
+                for labels, hist in series:
+                    label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+                    cumulative = 0
+                    for bound, bucket_count in zip([str(bound) for bound in hist.bounds] + ['+Inf'], hist.counts):
+                        cumulative += bucket_count
+                        bucket_labels = f'{label_text},le="{bound}"' if label_text else f'le="{bound}"'
+                        lines.append(f'{metric}_bucket{{{bucket_labels}}} {cumulative}')
+                    suffix = f'{{{label_text}}}' if label_text else ''
+                    lines.append(f'{metric}_sum{suffix} {hist.total}')
+                    lines.append(f'{metric}_count{suffix} {hist.count}')
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        self.export()
+        if self.path:
+            print(format_progress(self.progress()))
+
+
+def format_progress(progress):
+    total = f"/{progress['total']}" if progress['total'] is not None else ""
+    eta = f", ETA {progress['eta_seconds']:.0f}s" if progress['eta_seconds'] is not None else ""
+    return f"Anonymized {progress['documents']}{total} reports ({progress['docs_per_second']:.2f} docs/s{eta})"
@@ -0,0 +1,362 @@
+"""Output writers for ``RunIterator``.
+
+Each writer receives one finished report at a time through ``write`` and is
+closed once the run is complete:
+
+    * ``SingleOutputWriter``  -- ``--output single``: one directory per report.
+    * ``MergedOutputWriter``  -- ``--output merged``: three JSON files written at the end.
+    * ``JsonlOutputWriter``   -- ``--output merged --stream``: three JSONL files appended
+      to as each report finishes, so memory stays flat and a crash keeps finished reports.
+
+With ``--format parquet`` the same reports are written as zstd-compressed Parquet
+tables instead: ``PII_Log`` with one row per RecognizerResult, ``Iterator`` with
+one row per engine finding and ``Anonymized_Reports`` with one ``report_id``/``text``
+row per report. Merged Parquet output is streamed from ``Merged_Checkpoint.jsonl``
+in row groups on close, so it is resumable like merged JSON output.
+
+Append-only files report their byte ``offsets`` after every report so the run
+manifest (see ``checkpoint.py``) can truncate them back to a committed state
+when a run is resumed, and once more after ``close`` for their final sizes.
+``keep`` is called for reports skipped on resume. A writer whose
+``resumable_after_close`` is False cannot extend its outputs after a completed
+run (the merged checkpoint is gone), so the manifest is discarded once it has closed.
+"""
+
+import json
+import os
+
+from config import parquet_config
+from helpers import CreateOutputDir, SaveOutputs
+
+
+def _pii_log_rows(idx, pii_log):
+    for result in pii_log:
+        metadata = result.get('recognition_metadata') or {}
+        yield {
+            'report_id': str(idx),
+            'entity_type': result['entity_type'],
+            'start': result['start'],
+            'end': result['end'],
+            'score': result['score'],
+            'recognizer': metadata.get('recognizer_name'),
+        }
+
+
+def _iterator_rows(idx, doc_data):
+    for engine, findings in doc_data.items():
+        if isinstance(findings, list):
+            # 'Redact': flat list of entity strings
+            for entity_text in findings:
+                yield {'report_id': str(idx), 'engine': engine, 'entity_text': entity_text}
+        elif engine == 'Deny':
+            for entity_type, entities in findings.items():
+                for entity_text in entities:
+                    yield {'report_id': str(idx), 'engine': engine, 'entity_text': entity_text, 'entity_type': entity_type}
+        else:
+            for entity_text, (entity_type, score) in findings.items():
+                yield {'report_id': str(idx), 'engine': engine, 'entity_text': entity_text,
+                       'entity_type': entity_type, 'score': score}
+
+
+def _parquet_schemas():
+    import pyarrow as pa
+
+    return {
+        'log': pa.schema([
+            ('report_id', pa.string()), ('entity_type', pa.string()), ('start', pa.int64()),
+            ('end', pa.int64()), ('score', pa.float64()), ('recognizer', pa.string()),
+        ]),
+        'iterator': pa.schema([
+            ('report_id', pa.string()), ('engine', pa.string()), ('entity_text', pa.string()),
+            ('entity_type', pa.string()), ('score', pa.float64()),
+        ]),
+        'text': pa.schema([('report_id', pa.string()), ('text', pa.string())]),
+    }
+
+
+class _ParquetTable:
+    """Buffers rows and writes them to a Parquet file one row group at a time (renamed into place on close)."""
+
+    def __init__(self, path, schema):
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.tmp_path = f'{path}.tmp'
+        self.schema = schema
+        self.row_group_size = parquet_config['row_group_size']
+        self.writer = pq.ParquetWriter(self.tmp_path, schema, compression=parquet_config['compression'])
+        self._reset()
+
+    def _reset(self):
+        self.columns = {name: [] for name in self.schema.names}
+        self.pending = 0
+
+    def extend(self, rows):
+        for row in rows:
+            for name, values in self.columns.items():
+                values.append(row.get(name))
+            self.pending += 1
+            if self.pending >= self.row_group_size:
+                self.flush()
+
+    def flush(self):
+        import pyarrow as pa
+
+        if self.pending:
+            self.writer.write_table(pa.Table.from_pydict(self.columns, schema=self.schema))
+            self._reset()
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        os.replace(self.tmp_path, self.path)
+
+
+class _AppendOnlyFiles:
+    """Binary append handles whose byte offsets can be recorded and restored."""
+
+    def __init__(self, location, file_names, resume_offsets=None):
+        self.handles = {}
+        self.paths = {}
+        for key, name in file_names.items():
+            path = self.paths[key] = os.path.join(location, name)
+            if resume_offsets is not None and os.path.exists(path):
+                # Drop anything written after the last report the manifest committed
+                os.truncate(path, resume_offsets.get(key, 0))
+                self.handles[key] = open(path, 'ab')
+            else:
+                self.handles[key] = open(path, 'wb')
+
+    def append(self, key, record):
+        self.handles[key].write((json.dumps(record) + '\n').encode('utf-8'))
+
+    def flush(self):
+        for handle in self.handles.values():
+            handle.flush()
+
+    def offsets(self):
+        # Once closed the files may have been rewritten (compacted), so their sizes are the offsets
+        return {
+            key: os.path.getsize(self.paths[key]) if handle.closed else handle.tell()
+            for key, handle in self.handles.items()
+        }
+
+    def close(self):
+        for handle in self.handles.values():
+            handle.close()
+
+
+def _compact_jsonl(path, keep_ids):
+    """
+    Rewrite a ``{idx: value}`` JSONL file in place with only the last line of each id in *keep_ids*.
+
+    The file is left untouched when it already has exactly one line per kept id.
+    """
+    last_line = {}
+    lines = 0
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line_no, line in enumerate(fh):
+            (idx,) = json.loads(line)
+            last_line[idx] = line_no
+            lines += 1
+    if lines == len(last_line) and keep_ids.issuperset(last_line):
+        return
+
+    tmp_path = f'{path}.tmp'
+    with open(path, 'r', encoding='utf-8') as src, open(tmp_path, 'w', encoding='utf-8') as dst:
+        for line_no, line in enumerate(src):
+            (idx,) = json.loads(line)
+            if idx in keep_ids and last_line[idx] == line_no:
+                dst.write(line)
+    os.replace(tmp_path, path)
+
+
+class SingleOutputWriter:
+    resumable_after_close = True
+
+    def __init__(self, location, resume_offsets=None, output_format='json'):
+        self.location = location
+        self.output_format = output_format
+
+    def write(self, idx, text, doc_data, anon_report, pii_log):
+        # Save to individual subdirectories immediately
+        report_path = os.path.join(self.location, str(idx))
+        CreateOutputDir(report_path)
+
+        if self.output_format == 'parquet':
+            self._write_parquet(report_path, idx, text, doc_data, anon_report, pii_log)
+            return
+
+        SaveOutputs(doc_data, f'{report_path}/Iterator.json')
+        SaveOutputs(anon_report, f'{report_path}/Anonymized_Report.json')
+        SaveOutputs(pii_log, f'{report_path}/PII_Log.json')
+        SaveOutputs({idx: text}, f'{report_path}/Original_Report.json')
+
+    def _write_parquet(self, report_path, idx, text, doc_data, anon_report, pii_log):
+        schemas = _parquet_schemas()
+        tables = [
+            ('Iterator.parquet', 'iterator', _iterator_rows(idx, doc_data)),
+            ('Anonymized_Report.parquet', 'text', [{'report_id': str(idx), 'text': anon_report}]),
+            ('PII_Log.parquet', 'log', _pii_log_rows(idx, pii_log)),
+            ('Original_Report.parquet', 'text', [{'report_id': str(idx), 'text': text}]),
+        ]
+        for file_name, schema_name, rows in tables:
+            table = _ParquetTable(os.path.join(report_path, file_name), schemas[schema_name])
+            table.extend(rows)
+            table.close()
+
+    def keep(self, idx):
+        pass
+
+    def offsets(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class MergedOutputWriter:
+    """
+    Collects reports and writes Iterator/Anonymized_Reports/PII_Log ``.json`` on close.
+
+    Finished reports are also appended to ``Merged_Checkpoint.jsonl`` so a resumed
+    run can include reports completed before the interruption. With *output_format*
+    ``'parquet'`` the checkpoint is streamed into Parquet tables instead. The
+    checkpoint holds a second copy of every output (detected PII included), so it
+    is deleted once the final files are in place; only an interrupted run keeps it.
+    """
+
+    checkpoint_name = 'Merged_Checkpoint.jsonl'
+    resumable_after_close = True
+
+    def __init__(self, location, resume_offsets=None, output_format='json'):
+        self.location = location
+        self.output_format = output_format
+        self.keep_ids = set()
+        self.checkpoint_path = os.path.join(location, self.checkpoint_name)
+        self.parts = _AppendOnlyFiles(location, {'parts': self.checkpoint_name}, resume_offsets)
+        # A resumed checkpoint (or a repeated id) can hold stale entries that a later line replaces
+        self.has_stale_parts = resume_offsets is not None
+
+    def write(self, idx, text, doc_data, anon_report, pii_log):
+        if str(idx) in self.keep_ids:
+            self.has_stale_parts = True
+        self.keep_ids.add(str(idx))
+        self.parts.append('parts', {'id': idx, 'iterator': doc_data, 'anonymized': anon_report, 'log': pii_log})
+        self.parts.flush()
+
+    def keep(self, idx):
+        self.keep_ids.add(str(idx))
+
+    def offsets(self):
+        return self.parts.offsets()
+
+    def _iter_parts(self):
+        """Yield the checkpoint entry of every kept report (later lines win, so a re-run replaces a stale entry)."""
+        last_line = None
+        if self.has_stale_parts:
+            last_line = {}
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as fh:
+                for line_no, line in enumerate(fh):
+                    # Only the id is needed on this pass
+                    last_line[str(json.loads(line)['id'])] = line_no
+        # Without stale entries every line is the only one for its id, so one pass is enough
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as fh:
+            for line_no, line in enumerate(fh):
+                part = json.loads(line)
+                idx = str(part['id'])
+                if idx in self.keep_ids and (last_line is None or last_line[idx] == line_no):
+                    yield part
+
+    def close(self):
+        self.parts.close()
+        if self.output_format == 'parquet':
+            self._close_parquet()
+        elif not self._close_json():
+            # Keep the checkpoint so the outputs can still be recovered with --resume
+            return
+        os.remove(self.checkpoint_path)
+        self.resumable_after_close = False
+
+    def _close_json(self):
+        batch_iterator, batch_anonymized, batch_log = {}, {}, {}
+        for part in self._iter_parts():
+            idx = part['id']
+            batch_iterator[idx] = part['iterator']
+            batch_anonymized[idx] = part['anonymized']
+            batch_log[idx] = part['log']
+
+        saved = SaveOutputs(batch_iterator, f'{self.location}/Iterator.json')
+        saved &= SaveOutputs(batch_anonymized, f'{self.location}/Anonymized_Reports.json')
+        saved &= SaveOutputs(batch_log, f'{self.location}/PII_Log.json')
+        return saved
+
+    def _close_parquet(self):
+        schemas = _parquet_schemas()
+        iterator = _ParquetTable(os.path.join(self.location, 'Iterator.parquet'), schemas['iterator'])
+        anonymized = _ParquetTable(os.path.join(self.location, 'Anonymized_Reports.parquet'), schemas['text'])
+        log = _ParquetTable(os.path.join(self.location, 'PII_Log.parquet'), schemas['log'])
+        for part in self._iter_parts():
+            idx = part['id']
+            iterator.extend(_iterator_rows(idx, part['iterator']))
+            anonymized.extend([{'report_id': str(idx), 'text': part['anonymized']}])
+            log.extend(_pii_log_rows(idx, part['log']))
+        for table in (iterator, anonymized, log):
+            table.close()
+
+
+class JsonlOutputWriter:
+    """
+    Appends one ``{idx: value}`` line per report to Iterator/Anonymized_Reports/PII_Log ``.jsonl``.
+
+    A resumed run can append a report again (its text changed since the manifest
+    recorded it) or leave lines of reports that are no longer in the input, so the
+    files are compacted on close like ``MergedOutputWriter``: the last line per id
+    wins and only ids written or kept in this run remain.
+    """
+
+    file_names = {
+        'iterator': 'Iterator.jsonl',
+        'anonymized': 'Anonymized_Reports.jsonl',
+        'log': 'PII_Log.jsonl',
+    }
+
+    resumable_after_close = True
+
+    def __init__(self, location, resume_offsets=None):
+        self.location = location
+        self.keep_ids = set()
+        self.files = _AppendOnlyFiles(location, self.file_names, resume_offsets)
+
+    def write(self, idx, text, doc_data, anon_report, pii_log):
+        self.keep_ids.add(str(idx))
+        self.files.append('iterator', {idx: doc_data})
+        self.files.append('anonymized', {idx: anon_report})
+        self.files.append('log', {idx: pii_log})
+        self.files.flush()
+
+    def keep(self, idx):
+        self.keep_ids.add(str(idx))
+
+    def offsets(self):
+        return self.files.offsets()
+
+    def close(self):
+        self.files.close()
+        for name in self.file_names.values():
+            _compact_jsonl(os.path.join(self.location, name), self.keep_ids)
+
+
+def make_output_writer(output_arg, location, stream=False, resume_offsets=None, output_format='json'):
+    """
+    Return the writer for an ``--output`` value (``single`` or ``merged``) and ``--format`` (``json`` or ``parquet``).
+
+    *resume_offsets* are the byte offsets from the run manifest when resuming,
+    or None to start the outputs afresh.
+    """
+    if output_arg == 'single':
+        return SingleOutputWriter(location, resume_offsets, output_format)
+    # Merged Parquet is streamed from the checkpoint on close, so --stream needs no separate writer
+    if stream and output_format == 'json':
+        return JsonlOutputWriter(location, resume_offsets)
+    return MergedOutputWriter(location, resume_offsets, output_format)
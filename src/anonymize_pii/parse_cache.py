@@ -0,0 +1,113 @@
+"""Persistent on-disk cache of headhunter parse results (``--parse-cache``).
+
+``parse_reports`` asks the cache before parsing each input row. An entry holds
+the ``{id: text}`` reports that row produced (possibly none, when no heading
+matched) and its ``missing_headings`` diagnostics. Keys combine a hash of the
+row content (id and content columns) with the parse settings that shape the
+output -- mode, columns, ``parser_config``, ``expected_headings``,
+``match_threshold``, ``headings_to_anonymize``,
+``separate_headings_into_reports`` -- and the headhunter version, so changing
+any of them misses.
+
+The store is a local SQLite file with least-recently-used eviction bounded by
+entry count (``cache.evict_lru``, shared with the detection cache).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from importlib import metadata
+
+from cache import EVICT_CHECK_INTERVAL, evict_lru, format_hit_stats, hit_stats
+
+
+def _headhunter_version():
+    try:
+        return metadata.version('headhunter')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def parse_cache_id(config, mode, content_columns, expected_headings):
+    """Identity of the parse settings that determine a row's output."""
+    identity = {
+        'mode': mode,
+        'content_columns': content_columns,
+        'id_column': config.get('id_column'),
+        'parser_config': config.get('parser_config'),
+        'expected_headings': expected_headings,
+        'match_threshold': config.get('match_threshold', 80),
+        'headings_to_anonymize': config.get('headings_to_anonymize') or [],
+        'separate_headings_into_reports': bool(config.get('separate_headings_into_reports')),
+        'headhunter': _headhunter_version(),
+    }
+    return json.dumps(identity, sort_keys=True, default=str)
+
+
+def row_payload(values):
+    """Serialize a row's id and content values for hashing."""
+    return json.dumps(list(values), default=str)
+
+
+def format_parse_cache_stats(stats):
+    return format_hit_stats('Parse cache', stats)
+
+
+class ParseCache:
+    def __init__(self, path, identity, max_entries=1_000_000):
+        """
+        :param path: SQLite file to use (created if missing).
+        :param identity: ``parse_cache_id`` of the current parse settings; part of every key.
+        :param max_entries: Evict least recently used entries beyond this count.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.identity = identity
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS parsed (key TEXT PRIMARY KEY, payload TEXT, last_used REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS parsed_last_used ON parsed (last_used)')
+        self._conn.commit()
+
+    def _key(self, payload):
+        digest = hashlib.sha256()
+        for part in (self.identity, payload):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, payload):
+        """Return the cached ``{'reports': [[id, text], ...], 'missing': [...]}`` entry for a row, or None."""
+        key = self._key(payload)
+        row = self._conn.execute('SELECT payload FROM parsed WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute('UPDATE parsed SET last_used = ? WHERE key = ?', (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, payload, entry):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO parsed (key, payload, last_used) VALUES (?, ?, ?)',
+            (self._key(payload), json.dumps(entry), time.time()),
+        )
+        self._puts += 1
+        if self._puts % EVICT_CHECK_INTERVAL == 0:
+            evict_lru(self._conn, 'parsed', self.max_entries)
+            self._conn.commit()
+
+    def stats(self):
+        return hit_stats(self.hits, self.misses)
+
+    def close(self):
+        evict_lru(self._conn, 'parsed', self.max_entries)
+        self._conn.commit()
+        self._conn.close()
@@ -2,30 +2,97 @@
 
 Parses raw reports (JSON, single-column DataFrame, or multi-column DataFrame)
 into normalized ``{id: text}`` dictionaries that the anonymizer consumes.
+
+With ``chunk_rows`` set in the config, CSV/Parquet inputs are read
+``chunk_rows`` rows at a time (CSV chunks / Parquet record batches), keeping
+only ``id_column`` and ``content_columns``; each chunk is parsed and converted
+before the next one is read, so peak memory follows the chunk size rather than
+the file size.
+
+With ``workers`` > 1, JSON input is parsed on a process pool; documents come
+back in input order and per-document failures are collected like
+``ParsedBatch.errors`` instead of aborting the run.
+
+With ``cache_path`` set, each row's ``{id: text}`` output is stored in a
+``ParseCache`` (``parse_cache.py``) keyed on the row content and the parse
+settings, and unchanged rows skip headhunter on later runs.
 """
 
 import json
+import multiprocessing as mp
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, cast
+from typing import Iterator, Literal, cast
 
 import headhunter
 import pandas as pd
 from headhunter.models import ParsedBatch, ParsedText
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
-from config import parsed_report_location
+from config import parse_cache_config, parsed_report_location
 from helpers import CreateOutputDir, SaveOutputs
+from parse_cache import ParseCache, format_parse_cache_stats, parse_cache_id, row_payload
 
 
 _YAML_FRONTMATTER_RE = re.compile(r"\A---\n.*?\n---\n+", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
 _TABLE_SUFFIXES = {".csv", ".parquet", ".pq"}
 ProcessingMode = Literal["json", "single", "multi"]
 
 
+@lru_cache(maxsize=65536)
 def _normalize_heading(text: str) -> str:
     """Normalize heading text for case-insensitive matching."""
-    return re.sub(r"\s+", " ", text).strip().lower()
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def _doc_heading_norms(parsed: ParsedText) -> list[str]:
+    """Distinct non-empty normalized heading texts of a document, in document order."""
+    norms = dict.fromkeys(
+        _normalize_heading(ctx.token.content)
+        for ctx in parsed.hierarchy
+        if ctx.token.type == "heading"
+    )
+    norms.pop("", None)
+    return list(norms)
+
+
+class HeadingIndex:
+    """Fuzzy heading scores for a batch of documents, computed once.
+
+    ``process.cdist`` scores every target against every distinct heading of
+    the batch in one vectorized call; ``best_match`` then only picks the best
+    column among a document's own headings. Targets outside the index
+    (aliases added per document) fall back to ``process.extractOne``.
+    """
+
+    def __init__(self, documents: list[ParsedText], targets: list[str]):
+        headings = dict.fromkeys(norm for doc in documents for norm in _doc_heading_norms(doc))
+        self.columns = {heading: col for col, heading in enumerate(headings)}
+        self.rows = {target: row for row, target in enumerate(dict.fromkeys(targets))}
+        self.scores = None
+        if self.rows and self.columns:
+            self.scores = process.cdist(
+                list(self.rows),
+                list(self.columns),
+                scorer=fuzz.ratio,
+                workers=-1,
+            )
+
+    def best_match(self, target: str, doc_headings: list[str]) -> tuple[str | None, float]:
+        """Return the best-scoring heading among *doc_headings* for *target* and its score."""
+        if not doc_headings:
+            return None, 0.0
+        row = self.rows.get(target)
+        if row is not None and self.scores is not None and all(h in self.columns for h in doc_headings):
+            row_scores = self.scores[row, [self.columns[h] for h in doc_headings]]
+            best = int(row_scores.argmax())
+            return doc_headings[best], float(row_scores[best])
+        match = process.extractOne(target, doc_headings, scorer=fuzz.ratio)
+        if match is None:
+            return None, 0.0
+        return match[0], float(match[1])
 
 
 def _dedupe_headings_case_insensitive(headings: list[str]) -> list[str]:
@@ -80,15 +147,24 @@ def _infer_processing_mode(config: dict) -> tuple[ProcessingMode, list[str]]:
     )
 
 
+def _table_columns(config: dict, content_columns: list[str]) -> list[str]:
+    """Return the columns to read from a CSV/Parquet input (``id_column`` first, if set)."""
+    id_column = config.get("id_column")
+    columns = [id_column] if id_column else []
+    return [*columns, *(col for col in content_columns if col != id_column)]
+
+
 def _load_input(
     config: dict,
+    content_columns: list[str] | None = None,
 ) -> dict[str, str] | pd.DataFrame:
-    """Load the input file described by *config*."""
+    """Load the input file described by *config* (only the needed columns for tables)."""
     input_path = Path(config["input_path"])
     if not input_path.exists():
         raise FileNotFoundError(f"Input file not found: {input_path}")
 
     suffix = input_path.suffix.lower()
+    columns = _table_columns(config, content_columns) if content_columns else None
 
     if suffix == ".json":
         with open(input_path, "r", encoding="utf-8") as fh:
@@ -99,14 +175,43 @@ def _load_input(
             )
         return data
     if suffix == ".csv":
-        return pd.read_csv(input_path)
+        return pd.read_csv(input_path, usecols=columns)
     if suffix in {".parquet", ".pq"}:
-        return pd.read_parquet(input_path)
+        return pd.read_parquet(input_path, columns=columns)
     raise ValueError(
         f"Unsupported file extension '{suffix}'. Supported extensions are .json, .csv, .parquet, .pq"
     )
 
 
+def _iter_input_chunks(
+    config: dict,
+    content_columns: list[str],
+    chunk_rows: int,
+) -> Iterator[pd.DataFrame]:
+    """Yield the CSV/Parquet input as DataFrames of at most *chunk_rows* rows.
+
+    Only ``id_column`` and ``content_columns`` are read. Chunks keep a running
+    row index, so row numbers (and ids derived from them) match a full read.
+    """
+    input_path = Path(config["input_path"])
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    columns = _table_columns(config, content_columns)
+    if input_path.suffix.lower() == ".csv":
+        yield from pd.read_csv(input_path, usecols=columns, chunksize=chunk_rows)
+        return
+
+    import pyarrow.parquet as pq
+
+    row_offset = 0
+    for record_batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunk_rows, columns=columns):
+        df = record_batch.to_pandas()
+        df.index = pd.RangeIndex(row_offset, row_offset + len(df))
+        row_offset += len(df)
+        yield df
+
+
 def _resolve_expected_headings(
     config: dict,
     mode: ProcessingMode,
@@ -136,26 +241,69 @@ def _resolve_expected_headings(
     return _dedupe_headings_case_insensitive([*configured, *headings_to_anon])
 
 
-def _process_json(
-    reports: dict[str, str],
-    config: dict,
-    expected_headings: list[str] | None,
-) -> list[ParsedText]:
-    """Run ``headhunter.process_text`` on every entry of a ``{id: text}`` dict."""
-    parser_config = config.get("parser_config")
-    match_threshold = int(config.get("match_threshold", 80))
+# Per-process parse options; set directly for serial parsing or by _init_parse_worker in pool workers
+_parse_options: dict = {}
+
+
+def _init_parse_worker(parser_config, expected_headings, match_threshold) -> None:
+    _parse_options.update(
+        parser_config=parser_config,
+        expected_headings=expected_headings,
+        match_threshold=match_threshold,
+    )
+
 
-    documents: list[ParsedText] = []
-    for doc_id, text in reports.items():
+def _parse_json_document(item: tuple[int, tuple[str, str]]) -> tuple[ParsedText | None, dict | None]:
+    """Parse one ``(row_index, (id, text))`` item; return ``(document, None)`` or ``(None, error)``."""
+    row_index, (doc_id, text) = item
+    try:
         parsed = headhunter.process_text(
             text=text,
-            config=parser_config,
+            config=_parse_options["parser_config"],
             metadata={"id": doc_id},
-            expected_headings=expected_headings,
-            match_threshold=match_threshold,
+            expected_headings=_parse_options["expected_headings"],
+            match_threshold=_parse_options["match_threshold"],
         )
-        documents.append(parsed)
-    return documents
+    except Exception as exc:
+        return None, {"row_index": row_index, "id": doc_id, "error": f"{type(exc).__name__}: {exc}"}
+    return parsed, None
+
+
+def _process_json(
+    reports: dict[str, str],
+    config: dict,
+    expected_headings: list[str] | None,
+) -> tuple[list[ParsedText], list[dict]]:
+    """Run ``headhunter.process_text`` on every entry of a ``{id: text}`` dict.
+
+    Returns the parsed documents in input order and one ``{row_index, id, error}``
+    dict per report that failed. ``config['workers']`` > 1 parses on a process pool.
+    """
+    options = (
+        config.get("parser_config"),
+        expected_headings,
+        int(config.get("match_threshold", 80)),
+    )
+    workers = int(config.get("workers") or 1)
+    items = enumerate(reports.items())
+
+    if workers > 1 and len(reports) > 1:
+        start_method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        chunksize = max(1, min(64, len(reports) // (workers * 4)))
+        with mp.get_context(start_method).Pool(
+            processes=workers,
+            initializer=_init_parse_worker,
+            initargs=options,
+        ) as pool:
+            # imap yields results in input order
+            results = list(pool.imap(_parse_json_document, items, chunksize=chunksize))
+    else:
+        _init_parse_worker(*options)
+        results = [_parse_json_document(item) for item in items]
+
+    documents = [parsed for parsed, _ in results if parsed is not None]
+    errors = [error for _, error in results if error is not None]
+    return documents, errors
 
 
 def _process_single_column_df(
@@ -193,8 +341,13 @@ def _resolve_doc_heading_targets(
     headings_to_anonymize: list[str],
     match_threshold: int,
     allow_fuzzy_fallback: bool = True,
+    heading_index: HeadingIndex | None = None,
 ) -> set[str]:
-    """Resolve heading targets for a document, including fuzzy-matched aliases."""
+    """Resolve heading targets for a document, including fuzzy-matched aliases.
+
+    *heading_index* holds precomputed fuzzy scores for a batch that includes
+    *parsed*; without one, an index is built for this document alone.
+    """
     targets = {
         _normalize_heading(heading)
         for heading in headings_to_anonymize
@@ -225,27 +378,17 @@ def _resolve_doc_heading_targets(
 
     if allow_fuzzy_fallback:
         # Fallback: fuzzy-map unresolved targets to existing heading tokens in this document.
-        doc_heading_norms = {
-            _normalize_heading(ctx.token.content)
-            for ctx in parsed.hierarchy
-            if ctx.token.type == "heading"
-        }
-        doc_heading_norms.discard("")
-
-        for target in list(targets):
-            if target in doc_heading_norms:
-                continue
-
-            best_heading: str | None = None
-            best_score = 0.0
-            for heading_norm in doc_heading_norms:
-                score = float(fuzz.ratio(target, heading_norm))
-                if score > best_score:
-                    best_score = score
-                    best_heading = heading_norm
-
-            if best_heading is not None and best_score >= float(match_threshold):
-                targets.add(best_heading)
+        doc_headings = _doc_heading_norms(parsed)
+        doc_heading_set = set(doc_headings)
+        unresolved = [target for target in targets if target not in doc_heading_set]
+
+        if unresolved and doc_headings:
+            if heading_index is None:
+                heading_index = HeadingIndex([parsed], unresolved)
+            for target in unresolved:
+                best_heading, best_score = heading_index.best_match(target, doc_headings)
+                if best_heading is not None and best_score > 0 and best_score >= float(match_threshold):
+                    targets.add(best_heading)
 
     return targets
 
@@ -254,30 +397,37 @@ def _find_heading_subtree_spans(
     parsed: ParsedText,
     target_headings: set[str],
 ) -> list[tuple[int, int, str]]:
-    """Find hierarchy spans for heading subtrees selected by heading text."""
+    """Find hierarchy spans for heading subtrees selected by heading text.
+
+    A heading's subtree ends at the next heading of the same or a higher
+    level. All ends are found in one pass with a stack of open headings
+    (levels strictly increasing from bottom to top).
+    """
     if not target_headings:
         return []
 
     hierarchy = parsed.hierarchy
-    spans: list[tuple[int, int, str]] = []
+    # [hierarchy index, level, span slot or None] of headings whose subtree is still open
+    open_headings: list[list] = []
+    spans: list[list] = []
 
     for idx, ctx in enumerate(hierarchy):
         token = ctx.token
         if token.type != "heading":
             continue
-        if _normalize_heading(token.content) not in target_headings:
-            continue
 
-        end = idx + 1
-        while end < len(hierarchy):
-            next_ctx = hierarchy[end]
-            if next_ctx.token.type == "heading" and next_ctx.level <= ctx.level:
-                break
-            end += 1
+        while open_headings and open_headings[-1][1] >= ctx.level:
+            _, _, slot = open_headings.pop()
+            if slot is not None:
+                spans[slot][1] = idx
 
-        spans.append((idx, end, token.content))
+        slot = None
+        if _normalize_heading(token.content) in target_headings:
+            slot = len(spans)
+            spans.append([idx, len(hierarchy), token.content])
+        open_headings.append([idx, ctx.level, slot])
 
-    return spans
+    return [(start, end, heading) for start, end, heading in spans]
 
 
 def _merge_overlapping_spans(
@@ -342,8 +492,42 @@ def _hierarchy_to_markdown(hierarchy: list) -> str:
     return "\n".join(lines).rstrip()
 
 
-def _build_missing_heading_diagnostics(
+def _document_entries(
     documents: list[ParsedText],
+    config: dict,
+    mode: ProcessingMode,
+) -> dict[str, dict]:
+    """Return ``{doc_id: {"reports": [[key, text], ...], "missing": [...]}}`` for parsed documents.
+
+    Entries are what the parse cache stores for a row: the reports the
+    document contributes (none if no heading matched) and its
+    ``missing_headings`` diagnostics.
+    """
+    heading_index = _build_heading_index(documents, config, mode)
+    entries: dict[str, dict] = {}
+    for doc in documents:
+        missing = doc.metadata.get("missing_headings")
+        doc_reports = _build_reports_dict([doc], config, mode, heading_index)
+        entries[str(doc.metadata.get("id", ""))] = {
+            "reports": [[key, text] for key, text in doc_reports.items()],
+            "missing": [str(x) for x in missing] if isinstance(missing, list) else [],
+        }
+    return entries
+
+
+def _merge_entry(
+    doc_id: str,
+    entry: dict,
+    reports: dict[str, str],
+    missing_by_doc: dict[str, list[str]],
+) -> None:
+    reports.update((key, text) for key, text in entry["reports"])
+    if entry["missing"]:
+        missing_by_doc[doc_id] = entry["missing"]
+
+
+def _build_missing_heading_diagnostics(
+    missing_by_doc: dict[str, list[str]],
     configured_targets: list[str],
 ) -> str:
     """Build diagnostic text to help debug missing heading filters."""
@@ -352,12 +536,6 @@ def _build_missing_heading_diagnostics(
     if configured_targets:
         diagnostics.append(f"headings_to_anonymize={configured_targets}")
 
-    missing_by_doc: dict[str, list[str]] = {}
-    for doc in documents:
-        missing = doc.metadata.get("missing_headings")
-        if isinstance(missing, list) and missing:
-            missing_by_doc[str(doc.metadata.get("id", ""))] = [str(x) for x in missing]
-
     if missing_by_doc:
         diagnostics.append(f"missing_headings_by_doc={missing_by_doc}")
 
@@ -367,10 +545,24 @@ def _build_missing_heading_diagnostics(
     return " Diagnostics: " + "; ".join(diagnostics)
 
 
+def _build_heading_index(
+    documents: list[ParsedText],
+    config: dict,
+    mode: ProcessingMode,
+) -> HeadingIndex | None:
+    """Return a ``HeadingIndex`` over *documents* when fuzzy heading fallback applies, else None."""
+    headings_to_anon: list[str] = config.get("headings_to_anonymize") or []
+    if not headings_to_anon or mode not in {"json", "single"}:
+        return None
+    targets = [norm for norm in map(_normalize_heading, headings_to_anon) if norm]
+    return HeadingIndex(documents, targets)
+
+
 def _build_reports_dict(
     documents: list[ParsedText],
     config: dict,
     mode: ProcessingMode,
+    heading_index: HeadingIndex | None = None,
 ) -> dict[str, str]:
     """Convert a list of ``ParsedText`` objects to the ``{id: text}`` format.
 
@@ -391,6 +583,8 @@ def _build_reports_dict(
     match_threshold = int(config.get("match_threshold", 80)) if use_threshold else 0
 
     reports: dict[str, str] = {}
+    if heading_index is None and len(documents) > 1:
+        heading_index = _build_heading_index(documents, config, mode)
 
     for doc in documents:
         doc_key = str(doc.metadata.get("id", ""))
@@ -404,6 +598,7 @@ def _build_reports_dict(
             headings_to_anon,
             match_threshold,
             allow_fuzzy_fallback=use_threshold,
+            heading_index=heading_index,
         )
         selected_spans = _find_heading_subtree_spans(doc, target_headings)
         if not selected_spans:
@@ -436,6 +631,35 @@ def _build_reports_dict(
     return reports
 
 
+def _raise_batch_errors(batch: ParsedBatch, label: str) -> None:
+    """Raise ``ValueError`` listing every row error in *batch*."""
+    if not batch.errors:
+        return
+    error_msgs = "; ".join(
+        f"row {e.get('row_index', '?')}: {e.get('error', 'unknown')}"
+        for e in batch.errors
+    )
+    raise ValueError(f"Parsing errors in {label}: {error_msgs}")
+
+
+def _process_table(
+    df: pd.DataFrame,
+    config: dict,
+    mode: ProcessingMode,
+    content_columns: list[str],
+    expected_headings: list[str] | None,
+    chunk_label: str = "",
+) -> list[ParsedText]:
+    """Parse a CSV/Parquet DataFrame (or one chunk of it) in single- or multi-column mode."""
+    if mode == "single":
+        batch = _process_single_column_df(df, config, content_columns, expected_headings)
+        _raise_batch_errors(batch, f"batch{chunk_label}")
+    else:
+        batch = _process_multi_column_df(df, config, content_columns)
+        _raise_batch_errors(batch, f"structured batch{chunk_label}")
+    return batch.documents
+
+
 def parse_reports(headhunter_config: dict) -> dict[str, str]:
     """Parse raw input into ``{id: text}`` reports and export to disk.
 
@@ -448,6 +672,9 @@ def parse_reports(headhunter_config: dict) -> dict[str, str]:
     5. Builds an ``{id: text}`` dict compatible with the anonymizer.
     6. Exports the dict to ``data/parsed/Parsed_Reports.json``.
 
+    With ``chunk_rows`` set, CSV/Parquet input goes through steps 1, 4 and 5
+    one chunk at a time and the ``{id: text}`` dict is built up incrementally.
+
     Returns
     -------
     dict[str, str]
@@ -466,58 +693,133 @@ def parse_reports(headhunter_config: dict) -> dict[str, str]:
         mode,
         content_columns,
     )
-    raw_input = _load_input(headhunter_config)
-
-    documents: list[ParsedText]
+    chunk_rows = headhunter_config.get("chunk_rows")
 
-    if mode == "json":
-        if not isinstance(raw_input, dict):
-            raise ValueError("JSON input requires a {id: text} dict")
-        documents = _process_json(
-            cast(dict[str, str], raw_input),
-            headhunter_config,
-            expected_headings,
-        )
-
-    elif mode == "single":
-        if not isinstance(raw_input, pd.DataFrame):
-            raise ValueError("Single-column mode requires a DataFrame input")
-        batch = _process_single_column_df(
-            raw_input,
-            headhunter_config,
-            content_columns,
-            expected_headings,
-        )
-        if batch.errors:
-            error_msgs = "; ".join(
-                f"row {e.get('row_index', '?')}: {e.get('error', 'unknown')}"
-                for e in batch.errors
+    cache: ParseCache | None = None
+    if headhunter_config.get("cache_path"):
+        if mode != "json" and not headhunter_config.get("id_column"):
+            print("Parse cache needs id_column for CSV/Parquet input; parsing without it")
+        else:
+            cache = ParseCache(
+                headhunter_config["cache_path"],
+                parse_cache_id(headhunter_config, mode, content_columns, expected_headings),
+                max_entries=parse_cache_config["max_entries"],
             )
-            raise ValueError(f"Parsing errors in batch: {error_msgs}")
-        documents = batch.documents
-
-    elif mode == "multi":
-        if not isinstance(raw_input, pd.DataFrame):
-            raise ValueError("Multi-column mode requires a DataFrame input")
-        batch = _process_multi_column_df(raw_input, headhunter_config, content_columns)
-        if batch.errors:
-            error_msgs = "; ".join(
-                f"row {e.get('row_index', '?')}: {e.get('error', 'unknown')}"
-                for e in batch.errors
+
+    reports: dict[str, str] = {}
+    missing_by_doc: dict[str, list[str]] = {}
+    document_count = 0
+
+    try:
+        if mode == "json":
+            raw_input = _load_input(headhunter_config)
+            if not isinstance(raw_input, dict):
+                raise ValueError("JSON input requires a {id: text} dict")
+            items = list(cast(dict[str, str], raw_input).items())
+
+            cached: dict[str, dict] = {}
+            if cache is not None:
+                for doc_id, text in items:
+                    entry = cache.get(row_payload((doc_id, text)))
+                    if entry is not None:
+                        cached[doc_id] = entry
+
+            documents, errors = _process_json(
+                {doc_id: text for doc_id, text in items if doc_id not in cached},
+                headhunter_config,
+                expected_headings,
             )
-            raise ValueError(f"Parsing errors in structured batch: {error_msgs}")
-        documents = batch.documents
+            if errors:
+                error_msgs = "; ".join(
+                    f"row {e['row_index']} (id {e['id']}): {e['error']}" for e in errors
+                )
+                print(f"Skipped {len(errors)} reports with parsing errors: {error_msgs}")
+
+            parsed = _document_entries(documents, headhunter_config, mode)
+            for doc_id, text in items:
+                entry = cached.get(doc_id)
+                if entry is None:
+                    entry = parsed.get(str(doc_id))
+                    if entry is None:
+                        continue
+                    if cache is not None:
+                        cache.put(row_payload((doc_id, text)), entry)
+                document_count += 1
+                _merge_entry(str(doc_id), entry, reports, missing_by_doc)
+
+        elif mode in {"single", "multi"}:
+            if chunk_rows:
+                chunks = _iter_input_chunks(headhunter_config, content_columns, int(chunk_rows))
+            else:
+                chunks = iter([_load_input(headhunter_config, content_columns)])
+            columns = _table_columns(headhunter_config, content_columns)
+            # Cache entries are per row but parsed output is per id, so cached ids must be unique
+            seen_ids: set[str] = set()
+
+            row_offset = 0
+            for df in chunks:
+                if not isinstance(df, pd.DataFrame):
+                    raise ValueError(f"{mode.capitalize()}-column mode requires a DataFrame input")
+
+                # Rows as (id, *content) tuples; only cache misses go to headhunter
+                rows: list[tuple] = []
+                hits: list[dict | None] = []
+                parse_df = df
+                if cache is not None:
+                    rows = list(df[columns].itertuples(index=False, name=None))
+                    for row in rows:
+                        doc_id = str(row[0])
+                        if doc_id in seen_ids:
+                            raise ValueError(
+                                f"Parse cache needs unique values in id_column, but id {doc_id!r} appears "
+                                "in more than one row. Deduplicate the input or parse without the cache."
+                            )
+                        seen_ids.add(doc_id)
+                    hits = [cache.get(row_payload(row)) for row in rows]
+                    parse_df = df[[hit is None for hit in hits]]
+
+                documents = []
+                if len(parse_df):
+                    documents = _process_table(
+                        parse_df,
+                        headhunter_config,
+                        mode,
+                        content_columns,
+                        expected_headings,
+                        f" (input rows {row_offset}-{row_offset + len(df) - 1})" if chunk_rows else "",
+                    )
+                row_offset += len(df)
+                parsed = _document_entries(documents, headhunter_config, mode)
+
+                if cache is None:
+                    for doc_id, entry in parsed.items():
+                        document_count += 1
+                        _merge_entry(doc_id, entry, reports, missing_by_doc)
+                    continue
 
-    else:
-        raise ValueError(f"Unknown parse mode: {mode}")
+                for row, entry in zip(rows, hits):
+                    doc_id = str(row[0])
+                    if entry is None:
+                        entry = parsed.get(doc_id)
+                        if entry is None:
+                            continue
+                        cache.put(row_payload(row), entry)
+                    document_count += 1
+                    _merge_entry(doc_id, entry, reports, missing_by_doc)
+
+        else:
+            raise ValueError(f"Unknown parse mode: {mode}")
+    finally:
+        if cache is not None:
+            print(format_parse_cache_stats(cache.stats()))
+            cache.close()
 
-    if not documents:
+    if not document_count:
         raise ValueError("Parsing produced zero documents. Check input data.")
 
-    reports = _build_reports_dict(documents, headhunter_config, mode)
     if not reports:
         diagnostics = _build_missing_heading_diagnostics(
-            documents,
+            missing_by_doc,
             headhunter_config.get("headings_to_anonymize") or [],
         )
         raise ValueError(
@@ -0,0 +1,301 @@
+"""Long-running local anonymization service (``main.py --serve``).
+
+Engines are loaded once and stay resident. Reports posted to ``/anonymize``
+are queued, and a batcher coalesces concurrent requests into micro-batches of
+up to ``max_batch`` reports, waiting at most ``max_wait_ms`` for a batch to
+fill. Each batch goes through ``process_window``, so detection, anonymization
+and the PII log are the same as a CLI run with the same options (including
+``--gliner-batch-size``/``--*-batch-size`` batching inside a micro-batch).
+
+Batches run one at a time on a single thread, so every model is only ever
+called from one thread (engine-parallel mode still fans out inside a batch).
+At most ``concurrency`` requests are handled at once; a request that would
+push the queue past ``max_queue`` reports is answered ``503`` with
+``Retry-After`` (backpressure), and one with more than ``max_queue`` reports
+on its own, which could never fit, ``413``.
+
+Endpoints (JSON over HTTP/1.1 on localhost, or on a Unix socket):
+
+    * ``POST /anonymize`` -- ``{"text": ...}`` or ``{"id": ..., "text": ...}`` returns one
+      ``{"id", "anonymized", "pii_log", "iterator"}`` object; ``{"reports": {id: text}}`` or
+      ``{"reports": [{"id": ..., "text": ...}, ...]}`` returns ``{"reports": [...]}`` in input order.
+    * ``GET /health``     -- queue depth and batch/report counters.
+
+See ``client.py`` for a small client.
+"""
+
+import asyncio
+import itertools
+import json
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from config import server_config
+from helpers import format_filter_stats
+from memo import format_memo_stats
+
+# anonymizers and cache (presidio) are imported only when the service needs them
+
+
+class ServiceBusy(Exception):
+    """The request queue is full."""
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_reports(payload):
+    """Return ``(single, [(id, text), ...])`` from a request body."""
+    if not isinstance(payload, dict):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+
+    if 'reports' in payload:
+        reports = payload['reports']
+        if isinstance(reports, dict):
+            items = list(reports.items())
+        elif isinstance(reports, list):
+            items = [(report.get('id', pos) if isinstance(report, dict) else pos,
+                      report.get('text') if isinstance(report, dict) else report)
+                     for pos, report in enumerate(reports)]
+        else:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'reports' must be an {id: text} object or a list")
+        single = False
+    elif 'text' in payload:
+        items = [(payload.get('id', 0), payload['text'])]
+        single = True
+    else:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Expected 'text' or 'reports'")
+
+    for idx, text in items:
+        if not isinstance(text, str):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Report {idx!r} has no text")
+    return single, items
+
+
+class AnonymizationService:
+    def __init__(self, state, max_batch=32, max_wait_ms=20, max_queue=1024, concurrency=64, max_body_bytes=32 * 1024 ** 2,
+                 process=None):
+        """
+        :param state: Run state from ``build_run_state`` (engines, filter, mask, batch runners).
+        :param max_batch: Reports per micro-batch.
+        :param max_wait_ms: How long the first report of a batch waits for more to arrive.
+        :param max_queue: Queued reports beyond which requests are rejected with 503.
+        :param concurrency: Requests handled at once; further connections wait for a slot.
+        :param max_body_bytes: Larger request bodies are rejected with 413.
+        :param process: ``process(window, state)`` run on each micro-batch; defaults to ``process_window``.
+        """
+        if process is None:
+            from anonymizers import process_window as process
+        self.state = state
+        self.process = process
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms / 1000)
+        self.max_queue = max(1, int(max_queue))
+        self.concurrency = max(1, int(concurrency))
+        self.max_body_bytes = max_body_bytes
+        self.batches = 0
+        self.reports = 0
+        self.rejected = 0
+        self._keys = itertools.count()
+        # Created on the running loop in start()
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._executor = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='anonymize-batch')
+        self._batcher = asyncio.create_task(self._run_batcher())
+
+    async def close(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+        state = self.state
+        if state['fanout'] is not None:
+            state['fanout'].shutdown()
+        if state['cache'] is not None:
+            from cache import format_cache_stats
+            print(format_cache_stats(state['cache'].stats()))
+            state['cache'].close()
+        if state['memo'] is not None:
+            print(format_memo_stats(state['memo'].stats()))
+        print(format_filter_stats(state['pii_filter'].stats()))
+        print(f"Served {self.reports} reports in {self.batches} batches ({self.rejected} requests rejected)")
+
+    async def anonymize(self, items):
+        """Queue ``(id, text)`` reports and return their results in order. Raises ServiceBusy if the queue is full."""
+        if len(items) > self.max_queue:
+            # Retrying could never help, so this is not backpressure
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"More than {self.max_queue} reports in one request")
+        if self._queue.qsize() + len(items) > self.max_queue:
+            raise ServiceBusy()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for idx, text in items:
+            future = loop.create_future()
+            self._queue.put_nowait((next(self._keys), idx, text, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch):
+        # Internal keys keep reports with the same client id apart inside a window
+        window = [(str(key), text) for key, _, text, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            processed = await loop.run_in_executor(self._executor, self.process, window, self.state)
+        except Exception as exc:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, idx, _, future), (_, _, doc_data, anon_report, pii_log) in zip(batch, processed):
+            if not future.done():
+                future.set_result({'id': idx, 'anonymized': anon_report, 'pii_log': pii_log, 'iterator': doc_data})
+        self.batches += 1
+        self.reports += len(batch)
+
+    async def handle(self, reader, writer):
+        """asyncio stream handler: one request per connection."""
+        async with self._slots:
+            headers = {}
+            try:
+                status, payload = await self._respond(reader)
+            except RequestError as exc:
+                status, payload = exc.status, {'error': str(exc)}
+            except ServiceBusy:
+                self.rejected += 1
+                status, payload = HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'Queue full, retry later'}
+                headers['Retry-After'] = '1'
+            except (asyncio.IncompleteReadError, ConnectionError):
+                writer.close()
+                return
+            except Exception as exc:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(exc).__name__}: {exc}"}
+
+            body = json.dumps(payload).encode('utf-8')
+            head = [f"HTTP/1.1 {status.value} {status.phrase}", "Content-Type: application/json",
+                    f"Content-Length: {len(body)}", "Connection: close"]
+            head += [f"{name}: {value}" for name, value in headers.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def _respond(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        parts = request_line.split(' ')
+        if len(parts) != 3:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        method, path, _ = parts
+
+        content_length = 0
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ('\r\n', '\n', ''):
+                break
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'content-length':
+                try:
+                    content_length = int(value.strip() or 0)
+                except ValueError:
+                    content_length = -1
+                if content_length < 0:
+                    raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid Content-Length {value.strip()!r}")
+
+        if path == '/health' and method == 'GET':
+            return HTTPStatus.OK, {
+                'status': 'ok',
+                'queued': self._queue.qsize(),
+                'batches': self.batches,
+                'reports': self.reports,
+                'rejected': self.rejected,
+            }
+        if path != '/anonymize':
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown path {path}")
+        if method != 'POST':
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+        if content_length > self.max_body_bytes:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body over {self.max_body_bytes} bytes")
+
+        try:
+            payload = json.loads(await reader.readexactly(content_length))
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {exc}")
+
+        single, items = _parse_reports(payload)
+        results = await self.anonymize(items)
+        return HTTPStatus.OK, (results[0] if single else {'reports': results})
+
+
+async def _serve(service, host, port, unix_socket):
+    await service.start()
+    if unix_socket:
+        server = await asyncio.start_unix_server(service.handle, path=unix_socket)
+        print(f"Serving on unix socket {unix_socket}")
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        print(f"Serving on http://{host}:{port}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with server:
+        await stop.wait()
+    await service.close()
+
+
+def serve(warm_engines, skiplist, mask_arg, host=None, port=None, unix_socket=None, gliner_batch_size=None,
+          engine_parallel=False, cache_path=None, nlp_batch=None, detection_memo=False, span_mask=False,
+          engine_configs=None, **options):
+    """
+    Serve anonymization on *host*:*port* (default ``server_config``) or on *unix_socket* until SIGINT/SIGTERM.
+
+    *options* override the ``AnonymizationService`` settings in ``server_config``
+    (``max_batch``, ``max_wait_ms``, ``max_queue``, ``concurrency``, ``max_body_bytes``).
+    """
+    from anonymizers import build_run_state
+
+    state = build_run_state(
+        warm_engines, skiplist, mask_arg, gliner_batch_size, engine_parallel, cache_path, None, nlp_batch,
+        detection_memo, span_mask, engine_configs,
+    )
+    settings = {name: server_config[name] for name in ('max_batch', 'max_wait_ms', 'max_queue', 'concurrency', 'max_body_bytes')}
+    settings.update((name, value) for name, value in options.items() if value is not None)
+    service = AnonymizationService(state, **settings)
+    asyncio.run(_serve(service, host or server_config['host'], port or server_config['port'], unix_socket))
@@ -0,0 +1,133 @@
+"""Multi-process document execution for ``RunIterator``.
+
+Windows of reports are spread over a process pool and yielded back in input
+order. Engines are either loaded in the parent before fork, so model weights
+are shared copy-on-write, or loaded once per worker when the parent passes
+``warm_engines=None`` (spawn start method).
+"""
+
+import multiprocessing as mp
+import os
+import resource
+import sys
+from collections import deque
+
+from config import configs
+from engines import get_warm_engines
+from anonymizers import build_run_state, process_window
+from helpers import set_torch_threads, format_filter_stats
+from cache import format_cache_stats
+from memo import format_memo_stats
+from metrics import NULL_METRICS, RunMetrics
+
+
+# Per-process state; set in the parent before fork, or in each worker by _init_worker
+_worker_state = {}
+
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as fh:
+            resident_pages = int(fh.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _init_worker(device, skiplist, mask_arg, gliner_batch_size, engine_parallel, cache_path, engine_configs, torch_threads,
+                 collect_metrics, nlp_batch, detection_memo, span_mask):
+    set_torch_threads(torch_threads)
+    warm_engines = _worker_state.get('warm_engines')
+    if warm_engines is None:
+        warm_engines = get_warm_engines(engine_configs, device)
+    # Workers only collect; the parent merges what each window drains and writes the snapshots
+    metrics = RunMetrics() if collect_metrics else None
+    _worker_state['run_state'] = build_run_state(
+        warm_engines, skiplist, mask_arg, gliner_batch_size, engine_parallel, cache_path, metrics, nlp_batch,
+        detection_memo, span_mask, engine_configs,
+    )
+
+
+def _run_window(window):
+    run_state = _worker_state['run_state']
+    processed = process_window(window, run_state)
+    # Hit counters of this worker's detection cache, detection memo and PII filter (each worker has its own)
+    hit_stats = {name: run_state[name].stats() for name in ('cache', 'memo', 'pii_filter') if run_state[name] is not None}
+    return processed, os.getpid(), peak_rss_mb(), hit_stats, run_state['metrics'].drain()
+
+
+def _sum_hit_stats(worker_stats):
+    hits = sum(stats['hits'] for stats in worker_stats)
+    misses = sum(stats['misses'] for stats in worker_stats)
+    lookups = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / lookups if lookups else 0.0}
+
+
+def iter_parallel(windows, workers, warm_engines, device, skiplist, mask_arg, gliner_batch_size=None, engine_parallel=False,
+                  cache_path=None, engine_configs=None, max_pending=None, metrics=NULL_METRICS, nlp_batch=None,
+                  detection_memo=False, span_mask=False):
+    """
+    Process *windows* on *workers* processes and yield ``process_window`` results in input order.
+
+    At most *max_pending* windows (default ``4 * workers``) are in flight, so the
+    input can be a lazy iterator of any length.
+    """
+    engine_configs = engine_configs or configs
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    max_pending = max_pending or 4 * workers
+
+    if warm_engines is not None and 'fork' in mp.get_all_start_methods():
+        # Children inherit the loaded models from this process (copy-on-write)
+        context = mp.get_context('fork')
+        _worker_state['warm_engines'] = warm_engines
+    else:
+        context = mp.get_context('spawn')
+        _worker_state.pop('warm_engines', None)
+
+    peak_rss = {}
+    hit_stats = {}
+    pending = deque()
+    with context.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(device, skiplist, mask_arg, gliner_batch_size, engine_parallel, cache_path, engine_configs, torch_threads,
+                  metrics.enabled, nlp_batch, detection_memo, span_mask),
+    ) as pool:
+        for window in windows:
+            pending.append(pool.apply_async(_run_window, (window,)))
+            if len(pending) >= max_pending:
+                processed, pid, rss, stats, drained = pending.popleft().get()
+                peak_rss[pid] = max(rss, peak_rss.get(pid, 0))
+                hit_stats[pid] = stats
+                metrics.merge(drained)
+                yield processed
+        while pending:
+            processed, pid, rss, stats, drained = pending.popleft().get()
+            peak_rss[pid] = max(rss, peak_rss.get(pid, 0))
+            hit_stats[pid] = stats
+            metrics.merge(drained)
+            yield processed
+
+    _worker_state.pop('warm_engines', None)
+    for pid, rss in sorted(peak_rss.items()):
+        # With fork, shared copy-on-write model pages are counted in every worker's RSS
+        print(f"Worker {pid}: peak RSS {rss:.0f} MB")
+
+    # Per-worker hit counters are cumulative, so the latest value from each worker is its total
+    for name, format_stats in (('cache', format_cache_stats), ('memo', format_memo_stats), ('pii_filter', format_filter_stats)):
+        worker_stats = [stats[name] for stats in hit_stats.values() if name in stats]
+        if worker_stats:
+            print(format_stats(_sum_hit_stats(worker_stats)))
@@ -0,0 +1,72 @@
+"""EntityScanner.merge_chunk_results: shifting chunk results and resolving chunk overlaps."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+presidio_analyzer = pytest.importorskip("presidio_analyzer")
+
+from anonymizers import EntityScanner  # noqa: E402
+from chunking import Chunk  # noqa: E402
+from config import Entities, generalwords, timewords  # noqa: E402
+from helpers import PIIFilter  # noqa: E402
+
+RecognizerResult = presidio_analyzer.RecognizerResult
+
+
+def _scanner():
+    return EntityScanner(None, PIIFilter([], timewords, generalwords), Entities)
+
+
+def _spans(spans):
+    return [(res.entity_type, res.start, res.end, res.score) for res in spans]
+
+
+TEXT = "Seen in clinic today. Patient Jane Doe reported chest pain. Follow up in two weeks."
+NAME_START = TEXT.index("Jane Doe")
+
+
+def test_entity_in_overlap_keeps_the_higher_scoring_span():
+    # Both chunks contain the middle sentence; each sees a different extent of the name
+    first = Chunk(TEXT[:59], 0)
+    second = Chunk(TEXT[22:], 22)
+    chunk_results = [
+        (first, [RecognizerResult("PERSON", NAME_START, NAME_START + 8, 0.92)]),
+        (second, [RecognizerResult("PERSON", NAME_START - 22, NAME_START - 22 + 4, 0.71)]),
+    ]
+
+    spans = _scanner().merge_chunk_results(TEXT, chunk_results)
+
+    assert _spans(spans) == [("PERSON", NAME_START, NAME_START + 8, 0.92)]
+
+
+def test_overlap_tie_keeps_the_longer_span():
+    first = Chunk(TEXT[:59], 0)
+    second = Chunk(TEXT[22:], 22)
+    chunk_results = [
+        (first, [RecognizerResult("PERSON", NAME_START, NAME_START + 4, 0.8)]),
+        (second, [RecognizerResult("PERSON", NAME_START - 22, NAME_START - 22 + 8, 0.8)]),
+    ]
+
+    spans = _scanner().merge_chunk_results(TEXT, chunk_results)
+
+    assert _spans(spans) == [("PERSON", NAME_START, NAME_START + 8, 0.8)]
+
+
+def test_overlapping_spans_within_one_chunk_are_kept():
+    chunk_results = [(Chunk(TEXT, 0), [
+        RecognizerResult("PERSON", NAME_START, NAME_START + 8, 0.85),
+        RecognizerResult("PERSON", NAME_START + 5, NAME_START + 8, 0.6),
+        RecognizerResult("PERSON", NAME_START, NAME_START + 8, 0.5),
+    ])]
+
+    spans = _scanner().merge_chunk_results(TEXT, chunk_results)
+
+    assert _spans(spans) == [
+        ("PERSON", NAME_START, NAME_START + 8, 0.85),
+        ("PERSON", NAME_START + 5, NAME_START + 8, 0.6),
+    ]
@@ -0,0 +1,52 @@
+"""evict_lru: least-recently-used eviction shared by the detection and parse caches."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+pytest.importorskip("presidio_analyzer")
+
+from cache import evict_lru  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+
+
+def _table(rows):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, size INTEGER, last_used REAL)")
+    conn.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+    return conn
+
+
+def _keys(conn):
+    return [key for (key,) in conn.execute("SELECT key FROM entries ORDER BY last_used")]
+
+
+def test_count_bound_drops_least_recently_used():
+    conn = _table([("c", 1, 3.0), ("a", 1, 1.0), ("b", 1, 2.0)])
+    evict_lru(conn, "entries", max_entries=2)
+    assert _keys(conn) == ["b", "c"]
+
+
+def test_size_bound_drops_until_payload_fits():
+    conn = _table([("a", 50, 1.0), ("b", 30, 2.0), ("c", 30, 3.0)])
+    evict_lru(conn, "entries", max_entries=10, max_bytes=60)
+    assert _keys(conn) == ["b", "c"]
+
+
+def test_parse_cache_close_applies_the_bound(tmp_path):
+    cache = ParseCache(str(tmp_path / "parsed.sqlite"), "identity", max_entries=2)
+    for row in ("1", "2", "3"):
+        cache.put(row, {"reports": [[row, row]], "missing": []})
+    cache.close()
+
+    cache = ParseCache(str(tmp_path / "parsed.sqlite"), "identity", max_entries=2)
+    # Puts can share a timestamp, so only the count is certain
+    hits = [cache.get(row) is not None for row in ("1", "2", "3")]
+    assert hits.count(True) == 2
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+    cache.close()
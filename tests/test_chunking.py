@@ -0,0 +1,37 @@
+"""TextChunker: chunks are exact slices of the text, within budget, and overlapping."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from chunking import TextChunker, count_gliner_words  # noqa: E402
+
+
+def test_chunks_are_slices_within_budget():
+    text = " ".join(f"Sentence number {i} mentions Jane Doe." for i in range(40))
+    chunker = TextChunker(max_tokens=30, overlap_tokens=8)
+
+    chunks = chunker.chunk(text)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert text[chunk.start:chunk.end] == chunk.text
+        assert count_gliner_words(chunk.text) <= 30
+
+
+def test_long_sentence_pieces_overlap():
+    # One sentence far over budget, with a name that straddles the first split point
+    words = [f"w{i}" for i in range(20)] + ["Jane", "Doe"] + [f"x{i}" for i in range(20)]
+    text = " ".join(words) + "."
+    chunker = TextChunker(max_tokens=21, overlap_tokens=5)
+
+    chunks = chunker.chunk(text)
+
+    assert len(chunks) > 1
+    for previous, current in zip(chunks, chunks[1:]):
+        # Every piece starts inside the previous one, repeating up to overlap_tokens words
+        assert previous.start < current.start < previous.end
+        assert 0 < count_gliner_words(text[current.start:previous.end]) <= 5
+    assert any("Jane Doe" in chunk.text for chunk in chunks)
@@ -0,0 +1,44 @@
+"""Engine-major anonymization refuses span files that do not line up with the reports."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+pytest.importorskip("presidio_analyzer")
+
+from engine_major import _anonymize_from_spans, _ReportStore  # noqa: E402
+from metrics import NULL_METRICS  # noqa: E402
+
+
+class _Recorder:
+    """Writer and manifest stand-in that records the report ids it is given."""
+
+    def __init__(self):
+        self.ids = []
+
+    def write(self, idx, *outputs):
+        self.ids.append(idx)
+
+    def offsets(self):
+        return {}
+
+    def record(self, idx, text, offsets):
+        pass
+
+
+def test_short_span_file_raises_instead_of_dropping_reports(tmp_path):
+    reports = _ReportStore([("1", "Jane Doe"), ("2", "John Roe")], str(tmp_path), in_memory=False)
+    span_path = tmp_path / "spacy.jsonl"
+    # The engine pass stopped after the first report
+    span_path.write_text(json.dumps(["1", [[0, 8, "PERSON", 0.9, {}]]]) + "\n", encoding="utf-8")
+    writer = _Recorder()
+
+    with pytest.raises(ValueError):
+        _anonymize_from_spans(reports, ["spacy"], [str(span_path)], "entity", False, writer, writer, NULL_METRICS)
+
+    assert writer.ids == ["1"]
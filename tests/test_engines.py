@@ -0,0 +1,61 @@
+"""LeanStanzaNlpEngine: built for every stanza config and bulk-processing one call per batch."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+pytest.importorskip("presidio_analyzer")
+pytest.importorskip("stanza")
+
+from config import stanza as stanza_config  # noqa: E402
+from engines import LeanStanzaNlpEngine, get_warm_engines  # noqa: E402
+
+
+class _RecordingPipeline:
+    """Records the size of every ``bulk_process`` call and returns the documents unchanged."""
+
+    def __init__(self):
+        self.bulk_calls = []
+
+    def bulk_process(self, documents):
+        self.bulk_calls.append(len(documents))
+        return documents
+
+
+class _Tokenizer:
+    """The part of Presidio's StanzaTokenizer that process_batch relies on: ``snlp`` and ``__call__``."""
+
+    def __init__(self, snlp):
+        self.snlp = snlp
+
+    def __call__(self, text):
+        return self.snlp(text)
+
+
+def test_stanza_config_without_processors_loads_the_full_lean_pipeline(monkeypatch):
+    monkeypatch.setattr(LeanStanzaNlpEngine, "load", lambda self: None)
+
+    warm_engines = get_warm_engines([dict(stanza_config, processors=None)], "cpu")
+
+    nlp_engine = warm_engines["stanza"].nlp_engine
+    assert isinstance(nlp_engine, LeanStanzaNlpEngine)
+    assert nlp_engine.processors == "tokenize,pos,lemma,ner"
+
+
+def test_process_batch_makes_one_bulk_call_per_batch(monkeypatch):
+    pipeline = _RecordingPipeline()
+    engine = LeanStanzaNlpEngine(models=stanza_config["config"]["models"])
+    # nlp[language] is the spaCy Language wrapping Presidio's StanzaTokenizer
+    engine.nlp = {"en": SimpleNamespace(tokenizer=_Tokenizer(pipeline))}
+    monkeypatch.setattr(engine, "_doc_to_nlp_artifact", lambda doc, language: doc)
+    texts = [f"Report {i} mentions Jane Doe." for i in range(5)]
+
+    results = list(engine.process_batch(texts, "en", batch_size=2))
+
+    assert pipeline.bulk_calls == [2, 2, 1]
+    assert [(text, doc.text) for text, doc in results] == [(text, text) for text in texts]
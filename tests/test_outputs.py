@@ -0,0 +1,65 @@
+"""Merged and streamed output writers across an interrupted and a resumed run."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from checkpoint import MANIFEST_NAME, RunManifest  # noqa: E402
+from outputs import JsonlOutputWriter, MergedOutputWriter  # noqa: E402
+
+
+def _run(writer_class, location, reports, resume=False, interrupt_after=None):
+    """Write *reports* like RunIterator does; stop without closing after *interrupt_after* reports."""
+    manifest = RunManifest(str(location), "config", resume=resume)
+    writer = writer_class(str(location), manifest.offsets if resume else None)
+    for done, (idx, text) in enumerate(manifest.pending(reports.items(), writer)):
+        if done == interrupt_after:
+            # Every write and record is flushed, so the files are as a crash would leave them
+            return
+        writer.write(idx, text, {"engine": {text: ["PERSON", 1.0]}}, text.upper(), [])
+        manifest.record(idx, text, writer.offsets())
+    writer.close()
+    if writer.resumable_after_close:
+        manifest.close(writer.offsets())
+    else:
+        manifest.discard()
+
+
+def _jsonl(path):
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh]
+
+
+def test_merged_run_removes_checkpoint_and_manifest(tmp_path):
+    _run(MergedOutputWriter, tmp_path, {"1": "a", "2": "b"})
+
+    with open(tmp_path / "Anonymized_Reports.json", encoding="utf-8") as fh:
+        assert json.load(fh) == {"1": "A", "2": "B"}
+    assert not (tmp_path / MergedOutputWriter.checkpoint_name).exists()
+    assert not (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_merged_resume_keeps_finished_reports_and_replaces_changed_ones(tmp_path):
+    _run(MergedOutputWriter, tmp_path, {"1": "a", "2": "b", "3": "c"}, interrupt_after=2)
+    assert (tmp_path / MergedOutputWriter.checkpoint_name).exists()
+
+    _run(MergedOutputWriter, tmp_path, {"1": "a", "2": "changed", "3": "c"}, resume=True)
+
+    with open(tmp_path / "Anonymized_Reports.json", encoding="utf-8") as fh:
+        assert json.load(fh) == {"1": "A", "2": "CHANGED", "3": "C"}
+    assert not (tmp_path / MergedOutputWriter.checkpoint_name).exists()
+
+
+def test_streamed_resume_compacts_to_one_line_per_current_report(tmp_path):
+    _run(JsonlOutputWriter, tmp_path, {"1": "a", "2": "b", "3": "c"})
+    _run(JsonlOutputWriter, tmp_path, {"1": "a", "2": "changed", "4": "d"}, resume=True)
+    assert _jsonl(tmp_path / "Anonymized_Reports.jsonl") == [{"1": "A"}, {"2": "CHANGED"}, {"4": "D"}]
+
+    # The manifest's final offsets match the compacted files, so resuming again appends cleanly
+    _run(JsonlOutputWriter, tmp_path, {"1": "a", "2": "changed", "4": "d", "5": "e"}, resume=True)
+    assert _jsonl(tmp_path / "Anonymized_Reports.jsonl") == [{"1": "A"}, {"2": "CHANGED"}, {"4": "D"}, {"5": "E"}]
+    assert os.path.exists(tmp_path / MANIFEST_NAME)
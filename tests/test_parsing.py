@@ -0,0 +1,34 @@
+"""parse_reports with the parse cache: ids must be unique because cache entries are per row."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+pytest.importorskip("headhunter")
+
+from config import headhunter_config  # noqa: E402
+from parsing import parse_reports  # noqa: E402
+
+
+def test_parse_cache_rejects_repeated_ids(tmp_path):
+    csv_path = tmp_path / "reports.csv"
+    csv_path.write_text(
+        "report_id,report\n"
+        "1,Patient Jane Doe seen today.\n"
+        "1,Patient John Roe seen today.\n",
+        encoding="utf-8",
+    )
+    config = dict(
+        headhunter_config,
+        input_path=str(csv_path),
+        content_columns=["report"],
+        id_column="report_id",
+        cache_path=str(tmp_path / "parsed.sqlite"),
+    )
+
+    with pytest.raises(ValueError, match="unique"):
+        parse_reports(config)
@@ -0,0 +1,152 @@
+"""AnonymizationClient against an AnonymizationService with a stub run state (no engines needed)."""
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "anonymize_pii"))
+
+from client import AnonymizationClient, ServiceError  # noqa: E402
+from server import AnonymizationService  # noqa: E402
+
+
+def _stub_state():
+    filter_stats = {"hits": 0, "misses": 0, "hit_rate": 0.0}
+    return {"fanout": None, "cache": None, "memo": None, "pii_filter": SimpleNamespace(stats=lambda: filter_stats)}
+
+
+class StubProcess:
+    """Stands in for ``process_window``: upper-cases each report and records the batches it was given."""
+
+    def __init__(self):
+        self.batches = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, window, state):
+        self.entered.set()
+        self.release.wait(timeout=10)
+        self.batches.append([text for _, text in window])
+        return [(key, text, {"stub": {}}, text.upper(), []) for key, text in window]
+
+
+@contextmanager
+def running_service(process, **settings):
+    """Serve *process* on a free localhost port from a background event loop and yield a client."""
+    service = AnonymizationService(_stub_state(), process=process, **settings)
+    loop = asyncio.new_event_loop()
+
+    async def start():
+        await service.start()
+        return await asyncio.start_server(service.handle, "127.0.0.1", 0)
+
+    server = loop.run_until_complete(start())
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield AnonymizationClient(host="127.0.0.1", port=port, timeout=10), service
+    finally:
+        process.release.set()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.run_until_complete(service.close())
+        loop.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_batch_results_keep_input_order_across_micro_batches():
+    process = StubProcess()
+    reports = {str(i): f"report {i}" for i in range(5)}
+    with running_service(process, max_batch=2, max_wait_ms=50) as (client, service):
+        results = client.anonymize_batch(reports)
+        health = client.health()
+
+    assert [result["id"] for result in results] == list(reports)
+    assert [result["anonymized"] for result in results] == [text.upper() for text in reports.values()]
+    assert [len(batch) for batch in process.batches] == [2, 2, 1]
+    assert health["reports"] == 5 and health["batches"] == 3
+
+
+def test_single_report():
+    process = StubProcess()
+    with running_service(process) as (client, _):
+        result = client.anonymize("Jane Doe", report_id="7")
+
+    assert result["id"] == "7"
+    assert result["anonymized"] == "JANE DOE"
+    assert result["iterator"] == {"stub": {}}
+
+
+def test_duplicate_ids_are_kept_apart():
+    process = StubProcess()
+    with running_service(process, max_batch=8) as (client, _):
+        results = client.anonymize_batch([("a", "first"), ("a", "second"), ("b", "third")])
+
+    assert [(result["id"], result["anonymized"]) for result in results] == [
+        ("a", "FIRST"), ("a", "SECOND"), ("b", "THIRD"),
+    ]
+
+
+def test_more_reports_than_queue_is_rejected_with_413():
+    process = StubProcess()
+    with running_service(process, max_queue=2) as (client, service):
+        with pytest.raises(ServiceError) as error:
+            client.anonymize_batch({"1": "a", "2": "b", "3": "c"})
+
+    assert error.value.status == 413
+    assert service.rejected == 0
+    assert process.batches == []
+
+
+def test_full_queue_is_rejected_with_503():
+    process = StubProcess()
+    process.release.clear()
+    with running_service(process, max_batch=1, max_wait_ms=0, max_queue=2) as (client, service):
+        # The first report blocks the batcher, the next two fill the queue
+        first = threading.Thread(target=client.anonymize, args=("blocking",))
+        second = threading.Thread(target=client.anonymize_batch, args=({"2": "b", "3": "c"},))
+        first.start()
+        assert process.entered.wait(timeout=5)
+        second.start()
+        _wait_for(lambda: client.health()["queued"] == 2)
+
+        with pytest.raises(ServiceError) as error:
+            client.anonymize("overflow")
+
+        process.release.set()
+        first.join()
+        second.join()
+
+    assert error.value.status == 503
+    assert service.rejected == 1
+    assert service.reports == 3
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5"])
+def test_invalid_content_length_is_rejected_with_400(content_length):
+    process = StubProcess()
+    with running_service(process) as (client, _):
+        with socket.create_connection((client.host, client.port), timeout=10) as sock:
+            sock.sendall(f"POST /anonymize HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode("latin-1"))
+            response = sock.makefile("rb").readline()
+
+    assert response.startswith(b"HTTP/1.1 400 ")